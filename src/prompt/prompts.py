@@ -1,9 +1,16 @@
+from functools import lru_cache
 from utils.mcp import Server
 
 
 mcp = Server().mcp
 
 
+@lru_cache(maxsize=256)
+def _pattern_info(pattern: str) -> str:
+    """Describe the file filter applied for the given pattern."""
+    return f"using pattern: '{pattern}'" if pattern else "for all .yaml files"
+
+
 @mcp.prompt()
 def helm_unittest_assistant(test_directory: str, pattern: str = "") -> str:
     """Create a prompt to assist with analyzing Helm unittest files.
@@ -21,7 +28,7 @@ def helm_unittest_assistant(test_directory: str, pattern: str = "") -> str:
         A formatted prompt string to guide the assistant in analyzing Helm tests
     """
 
-    pattern_info = f"using pattern: '{pattern}'" if pattern else "for all .yaml files"
+    pattern_info = _pattern_info(pattern)
 
     return f"""You are a Helm unittest expert assistant. Your task is to help analyze and work with Helm unittest test files.
 
@@ -65,7 +72,7 @@ def validate_helm_tests(test_directory: str, pattern: str = "") -> str:
         A formatted prompt string for the assistant to validate Helm tests schema
     """
 
-    pattern_info = f"using pattern: '{pattern}'" if pattern else "for all .yaml files"
+    pattern_info = _pattern_info(pattern)
 
     return f"""You are a Helm unittest validation assistant. Your goal is to ensure that Helm unittest test files are correctly structured according to the official JSON schema.
 
@@ -1,10 +1,16 @@
 import pytest
+from contextlib import nullcontext
 from unittest.mock import patch, mock_open, MagicMock
 import yaml
 import os
-from tools.get_tests import get_tests, get_test_from_file
+import stat
+from tools.get_tests import get_tests, get_test_from_file, iter_tests
 from utils.dtos import TestFile
 
+# Stat results for mocking os.stat on a directory and on a regular file
+DIR_STAT = os.stat_result((stat.S_IFDIR | 0o755,) + (0,) * 9)
+FILE_STAT = os.stat_result((stat.S_IFREG | 0o644,) + (0,) * 9)
+
 # Sample YAML content for testing
 VALID_YAML = """
 suite: Test Suite
@@ -27,6 +33,23 @@ suite: Test Suite
 # missing tests
 """
 
+MERGE_KEYS_YAML = """
+defaults: &defaults
+  it: shared name
+  asserts:
+    - isKind:
+        of: Deployment
+suite: Test Suite
+tests:
+  - <<: *defaults
+  - <<: *defaults
+    it: overridden name
+"""
+
+JSON_CONTENT = b"""
+{"suite": "Json Suite", "tests": [{"it": "should render deployment", "asserts": []}]}
+"""
+
 NOT_A_DICT_YAML = """
 - just
 - a
@@ -34,6 +57,30 @@ NOT_A_DICT_YAML = """
 """
 
 
+def fake_scandir(layout):
+    """Build an os.scandir replacement serving an os.walk-style layout.
+
+    Args:
+        layout: List of (dir_path, dir_names, file_names) tuples
+    """
+    tree = {root: (dirs, files) for root, dirs, files in layout}
+
+    def entry(root, name, is_dir):
+        e = MagicMock()
+        e.name = name
+        e.path = os.path.join(root, name)
+        e.is_dir.return_value = is_dir
+        e.is_symlink.return_value = False
+        return e
+
+    def scandir(path):
+        dirs, files = tree[path]
+        entries = [entry(path, d, True) for d in dirs] + [entry(path, f, False) for f in files]
+        return nullcontext(iter(entries))
+
+    return scandir
+
+
 def test_get_test_from_file_success():
     with patch("builtins.open", mock_open(read_data=VALID_YAML)):
         result = get_test_from_file("fake_path.yaml")
@@ -45,6 +92,56 @@ def test_get_test_from_file_success():
         assert result.file_path == "fake_path.yaml"
 
 
+def test_get_test_from_file_results_are_independent():
+    with patch("builtins.open", mock_open(read_data=VALID_YAML)):
+        first = get_test_from_file("first.yaml")
+        first.release["name"] = "changed"
+        second = get_test_from_file("second.yaml")
+
+        assert second.release == {"name": "my-release", "namespace": "default"}
+
+
+def test_get_test_from_file_cached_results_are_independent(tmp_path):
+    test_file = tmp_path / "test.yaml"
+    test_file.write_text(VALID_YAML)
+
+    first = get_test_from_file(str(test_file))
+    first.release["name"] = "changed"
+    first.tests.clear()
+    second = get_test_from_file(str(test_file))
+
+    assert second.release == {"name": "my-release", "namespace": "default"}
+    assert second.tests == ["should render deployment", "should render service"]
+
+
+def test_get_test_from_file_merge_keys():
+    with patch("builtins.open", mock_open(read_data=MERGE_KEYS_YAML)):
+        result = get_test_from_file("merge.yaml")
+
+        assert result.tests == ["shared name", "overridden name"]
+        assert result.release == {}
+
+
+def test_get_test_from_file_json():
+    with patch("builtins.open", mock_open(read_data=JSON_CONTENT)):
+        result = get_test_from_file("test.json")
+
+        assert result.suite == "Json Suite"
+        assert result.tests == ["should render deployment"]
+        assert result.release == {}
+
+
+@pytest.mark.parametrize("suite", ["1e3", "1.5e3", "NaN", "-Infinity"])
+def test_get_test_from_file_json_numbers_read_as_yaml(suite):
+    # json would read these as floats, YAML reads them as strings
+    content = f'{{"suite": {suite}, "tests": [{{"it": "a"}}]}}'
+    with patch("builtins.open", mock_open(read_data=content.encode())):
+        result = get_test_from_file("test.json")
+
+        assert result.suite == suite
+        assert result.tests == ["a"]
+
+
 def test_get_test_from_file_not_found():
     with patch("builtins.open", side_effect=FileNotFoundError):
         with pytest.raises(FileNotFoundError):
@@ -53,10 +150,27 @@ def test_get_test_from_file_not_found():
 
 def test_get_test_from_file_invalid_yaml():
     with patch("builtins.open", mock_open(read_data=INVALID_YAML)):
-        with pytest.raises(yaml.YAMLError):
+        # The YAML error mark names the file, not "<byte string>"
+        with pytest.raises(yaml.YAMLError, match='in "invalid.yaml"'):
             get_test_from_file("invalid.yaml")
 
 
+def test_get_test_from_file_ignores_unconstructed_values():
+    # Only suite, release and the test names are constructed
+    content = "suite: Test Suite\ntests:\n  - it: first\n    asserts: !!unknown value\n"
+    with patch("builtins.open", mock_open(read_data=content.encode())):
+        result = get_test_from_file("tagged.yaml")
+
+        assert result.tests == ["first"]
+
+
+def test_get_test_from_file_invalid_release_value():
+    content = "suite: Test Suite\ntests:\n  - it: first\nrelease: !!unknown value\n"
+    with patch("builtins.open", mock_open(read_data=content.encode())):
+        with pytest.raises(yaml.YAMLError):
+            get_test_from_file("tagged.yaml")
+
+
 def test_get_test_from_file_missing_fields():
     with patch("builtins.open", mock_open(read_data=MISSING_FIELDS_YAML)):
         with pytest.raises(KeyError):
@@ -69,29 +183,76 @@ def test_get_test_from_file_not_a_dict():
             get_test_from_file("not_a_dict.yaml")
 
 
+@pytest.mark.parametrize("content", [
+    "suite: Test Suite\ntests:\n  - it: first\n  - asserts: []\n",
+    '{"suite": "Test Suite", "tests": [{"it": "first"}, {"asserts": []}]}',
+])
+def test_get_test_from_file_missing_test_name(content):
+    with patch("builtins.open", mock_open(read_data=content.encode())):
+        with pytest.raises(ValueError, match=r"Test #2 in missing_it.yaml is missing the 'it' field"):
+            get_test_from_file("missing_it.yaml")
+
+
+def test_get_test_from_file_null_test_name():
+    content = "suite: Test Suite\ntests:\n  - it: first\n  - it: null\n"
+    with patch("builtins.open", mock_open(read_data=content.encode())):
+        with pytest.raises(ValueError, match=r"Test #2 in null_it.yaml must have a string 'it' field, got NoneType"):
+            get_test_from_file("null_it.yaml")
+
+
+@pytest.mark.parametrize("content, type_name", [
+    ("suite: Test Suite\ntests:\n  - it: first\n  - foo\n", "str"),
+    ("suite: Test Suite\ntests:\n  - it: first\n  - 42\n", "int"),
+    ('{"suite": "Test Suite", "tests": [{"it": "first"}, "foo"]}', "str"),
+    ('{"suite": "Test Suite", "tests": [{"it": "first"}, [1]]}', "list"),
+])
+def test_get_test_from_file_test_not_a_mapping(content, type_name):
+    with patch("builtins.open", mock_open(read_data=content.encode())):
+        with pytest.raises(ValueError, match=rf"Test #2 in bad.yaml must be a mapping with a string 'it' field, got {type_name}"):
+            get_test_from_file("bad.yaml")
+
+
+def test_get_test_from_file_tagged_root():
+    content = "--- !!set\nsuite: S\ntests:\n  - it: a\n"
+    with patch("builtins.open", mock_open(read_data=content.encode())):
+        with pytest.raises(TypeError, match="got set"):
+            get_test_from_file("tagged.yaml")
+
+
+@pytest.mark.parametrize("content, error", [
+    ("suite: S\ntests:\n  - !foo {it: a}\n", yaml.YAMLError),
+    ("suite: S\ntests:\n  - !!set {it: a}\n", ValueError),
+    ("suite: S\ntests: !foo\n  - it: a\n", yaml.YAMLError),
+])
+def test_get_test_from_file_tagged_tests(content, error):
+    with patch("builtins.open", mock_open(read_data=content.encode())):
+        with pytest.raises(error):
+            get_test_from_file("tagged.yaml")
+
+
 def test_get_test_from_file_empty():
     with patch("builtins.open", mock_open(read_data="")):
         with pytest.raises(ValueError):
             get_test_from_file("empty.yaml")
 
 
-@patch("os.path.exists")
-@patch("os.path.isdir")
-@patch("os.walk")
+@patch("os.stat")
+@patch("os.scandir")
 @patch("tools.get_tests.get_test_from_file")
-def test_get_tests_success(mock_get_test, mock_walk, mock_isdir, mock_exists):
+def test_get_tests_success(mock_get_test, mock_scandir, mock_stat):
     # Setup mocks
-    mock_exists.return_value = True
-    mock_isdir.return_value = True
-    mock_walk.return_value = [
+    mock_stat.return_value = DIR_STAT
+    mock_scandir.side_effect = fake_scandir([
         ("/root", ["dir1"], ["test1.yaml", "other.txt"]),
         ("/root/dir1", [], ["test2.yaml"])
-    ]
+    ])
 
-    mock_get_test.side_effect = [
-        TestFile(suite="Suite 1", tests=["t1"], release={}, file_path="/root/test1.yaml"),
-        TestFile(suite="Suite 2", tests=["t2"], release={}, file_path="/root/dir1/test2.yaml")
-    ]
+    test_files = {
+        "/root/test1.yaml": TestFile(suite="Suite 1", tests=["t1"], release={}, file_path="/root/test1.yaml"),
+        "/root/dir1/test2.yaml": TestFile(suite="Suite 2", tests=["t2"], release={}, file_path="/root/dir1/test2.yaml")
+    }
+    # Files are parsed concurrently, so answer by path rather than call order
+    mock_get_test.side_effect = test_files.__getitem__
 
     results = get_tests("/root")
 
@@ -101,16 +262,14 @@ def test_get_tests_success(mock_get_test, mock_walk, mock_isdir, mock_exists):
     assert mock_get_test.call_count == 2
 
 
-@patch("os.path.exists")
-@patch("os.path.isdir")
-@patch("os.walk")
+@patch("os.stat")
+@patch("os.scandir")
 @patch("tools.get_tests.get_test_from_file")
-def test_get_tests_with_pattern(mock_get_test, mock_walk, mock_isdir, mock_exists):
-    mock_exists.return_value = True
-    mock_isdir.return_value = True
-    mock_walk.return_value = [
+def test_get_tests_with_pattern(mock_get_test, mock_scandir, mock_stat):
+    mock_stat.return_value = DIR_STAT
+    mock_scandir.side_effect = fake_scandir([
         ("/root", [], ["test1.yaml", "special_test.yaml", "other.yaml"])
-    ]
+    ])
 
     mock_get_test.side_effect = [
         TestFile(suite="Special Suite", tests=["t1"], release={}, file_path="/root/special_test.yaml")
@@ -124,42 +283,36 @@ def test_get_tests_with_pattern(mock_get_test, mock_walk, mock_isdir, mock_exist
     mock_get_test.assert_called_once_with("/root/special_test.yaml")
 
 
-@patch("os.path.exists")
-def test_get_tests_dir_not_found(mock_exists):
-    mock_exists.return_value = False
+@patch("os.stat")
+def test_get_tests_dir_not_found(mock_stat):
+    mock_stat.side_effect = FileNotFoundError
     with pytest.raises(FileNotFoundError):
         get_tests("/nonexistent")
 
 
-@patch("os.path.exists")
-@patch("os.path.isdir")
-def test_get_tests_not_a_directory(mock_isdir, mock_exists):
-    mock_exists.return_value = True
-    mock_isdir.return_value = False
+@patch("os.stat")
+def test_get_tests_not_a_directory(mock_stat):
+    mock_stat.return_value = FILE_STAT
     with pytest.raises(NotADirectoryError):
         get_tests("/path/to/file")
 
 
-@patch("os.path.exists")
-@patch("os.path.isdir")
-def test_get_tests_invalid_pattern(mock_isdir, mock_exists):
-    mock_exists.return_value = True
-    mock_isdir.return_value = True
+@patch("os.stat")
+def test_get_tests_invalid_pattern(mock_stat):
+    mock_stat.return_value = DIR_STAT
     with pytest.raises(ValueError, match="Invalid regex pattern"):
         get_tests("/root", pattern="[invalid")
 
 
-@patch("os.path.exists")
-@patch("os.path.isdir")
-@patch("os.walk")
+@patch("os.stat")
+@patch("os.scandir")
 @patch("tools.get_tests.get_test_from_file")
-def test_get_tests_resilience(mock_get_test, mock_walk, mock_isdir, mock_exists):
+def test_get_tests_resilience(mock_get_test, mock_scandir, mock_stat):
     # Test that get_tests continues even if one file fails to parse
-    mock_exists.return_value = True
-    mock_isdir.return_value = True
-    mock_walk.return_value = [
+    mock_stat.return_value = DIR_STAT
+    mock_scandir.side_effect = fake_scandir([
         ("/root", [], ["good.yaml", "bad.yaml", "another_good.yaml"])
-    ]
+    ])
 
     def side_effect(path):
         if "bad" in path:
@@ -174,3 +327,63 @@ def test_get_tests_resilience(mock_get_test, mock_walk, mock_isdir, mock_exists)
     assert results[0].file_path == "/root/good.yaml"
     assert results[1].file_path == "/root/another_good.yaml"
     assert mock_get_test.call_count == 3
+
+
+@patch("os.stat")
+@patch("os.scandir")
+@patch("tools.get_tests.get_test_from_file")
+def test_iter_tests_yields_lazily(mock_get_test, mock_scandir, mock_stat):
+    mock_stat.return_value = DIR_STAT
+    mock_scandir.side_effect = fake_scandir([
+        ("/root", [], ["test1.yaml", "test2.yaml"])
+    ])
+    mock_get_test.side_effect = lambda path: TestFile(suite=path, tests=["t"], release={}, file_path=path)
+
+    results = iter_tests("/root")
+
+    # Nothing is walked or parsed until the iterator is consumed
+    mock_scandir.assert_not_called()
+    assert [result.file_path for result in results] == ["/root/test1.yaml", "/root/test2.yaml"]
+
+
+@patch("os.stat")
+def test_iter_tests_validates_eagerly(mock_stat):
+    mock_stat.side_effect = FileNotFoundError
+    with pytest.raises(FileNotFoundError):
+        iter_tests("/nonexistent")
+
+
+@patch("os.stat")
+@patch("os.scandir")
+@patch("tools.get_tests.get_test_from_file")
+def test_get_tests_survives_directory_errors(mock_get_test, mock_scandir, mock_stat):
+    mock_stat.return_value = DIR_STAT
+    scandir = fake_scandir([
+        ("/root", ["gone", "broken", "ok"], ["test1.yaml", "odd.yaml"]),
+        ("/root/broken", [], ["lost.yaml"]),
+        ("/root/ok", [], ["test2.yaml"]),
+    ])
+
+    def flaky_scandir(path):
+        if path == "/root/gone":
+            # Removed between being listed and being walked
+            raise FileNotFoundError(path)
+        with scandir(path) as listing:
+            entries = list(listing)
+        if path == "/root":
+            odd = next(e for e in entries if e.name == "odd.yaml")
+            odd.is_dir.side_effect = OSError("Stale file handle")
+        if path == "/root/broken":
+            def failing():
+                yield from entries
+                raise PermissionError(path)
+            return nullcontext(failing())
+        return nullcontext(iter(entries))
+
+    mock_scandir.side_effect = flaky_scandir
+    mock_get_test.side_effect = lambda path: TestFile(suite=path, tests=["t"], release={}, file_path=path)
+
+    results = get_tests("/root")
+
+    # Like os.walk: unknown entry types count as files, failing directories are skipped
+    assert [result.file_path for result in results] == ["/root/test1.yaml", "/root/odd.yaml", "/root/ok/test2.yaml"]
@@ -11,6 +11,7 @@ import os
 import tempfile
 import shutil
 from pathlib import Path
+from unittest.mock import patch
 from tools.get_tests import get_tests, get_test_from_file
 from utils.dtos import TestFile
 
@@ -132,6 +133,19 @@ class TestGetTestFromFileIntegration:
         assert "suite" in str(exc_info.value).lower()
         assert "empty" in str(exc_info.value).lower()
 
+    def test_parse_file_reparsed_after_change(self, temp_test_dir):
+        """Test that repeat parses are cached until the file changes."""
+        test_file = os.path.join(temp_test_dir, "cached.yaml")
+        with open(test_file, "w") as f:
+            f.write("suite: Before\ntests:\n  - it: test case\n")
+        first = get_test_from_file(test_file)
+        with patch("tools.get_tests._parse_test_file", side_effect=AssertionError("not cached")):
+            assert get_test_from_file(test_file) == first
+        # Rewrite with a different size so the stat fingerprint changes
+        with open(test_file, "w") as f:
+            f.write("suite: After change\ntests:\n  - it: test case\n")
+        assert get_test_from_file(test_file).suite == "After change"
+
 
 class TestGetTestsIntegration:
     """Integration tests for get_tests function."""
@@ -286,6 +300,18 @@ class TestGetTestsEdgeCases:
         suites = {result.suite for result in results}
         assert suites == {"Suite 1", "Suite 2", "Suite 3", "Suite 4"}
 
+    def test_snapshot_directories_are_skipped(self, temp_test_dir):
+        """Test that __snapshot__ and .git directories are not searched."""
+        for name in ["__snapshot__", ".git"]:
+            skipped_dir = os.path.join(temp_test_dir, name)
+            os.makedirs(skipped_dir)
+            with open(os.path.join(skipped_dir, "ignored.yaml"), "w") as f:
+                f.write("suite: Ignored\ntests:\n  - it: ignored\n")
+        with open(os.path.join(temp_test_dir, "test.yaml"), "w") as f:
+            f.write("suite: Found\ntests:\n  - it: found\n")
+        results = get_tests(temp_test_dir)
+        assert [result.suite for result in results] == ["Found"]
+
     def test_file_with_minimal_valid_structure(self, temp_test_dir):
         """Test parsing a file with minimal valid structure."""
         minimal_file = os.path.join(temp_test_dir, "minimal.yaml")
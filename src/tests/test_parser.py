@@ -1,8 +1,9 @@
+import os
 from typing import cast
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import xml.etree.ElementTree as ET
-from utils.parser import TestResultParser, TestFormat
+from utils.parser import TestResultParser, TestFormat, get_parser
 from utils.dtos import TestResultSummary
 
 # Sample XML contents
@@ -88,24 +89,50 @@ def test_parse_junit_string():
     assert "Ignored\nSkip Reason" == result.test_cases[2].message
 
 
-@patch("pathlib.Path.exists")
-@patch("pathlib.Path.is_file")
-@patch("xml.etree.ElementTree.parse")
-def test_parse_junit_file(mock_et_parse, mock_is_file, mock_exists):
-    mock_exists.return_value = True
-    mock_is_file.return_value = True
+def test_parse_junit_file(tmp_path):
+    report = tmp_path / "report.xml"
+    report.write_text(JUNIT_XML, encoding="utf-8")
 
-    # Setup mock tree and root
-    mock_root = ET.fromstring(JUNIT_XML)
-    mock_tree = MagicMock()
-    mock_tree.getroot.return_value = mock_root
-    mock_et_parse.return_value = mock_tree
+    parser = TestResultParser("junit")
+    result = parser.parse(str(report))
+
+    assert result.total == 3
+
+
+def test_parse_file_stats_once_when_cached(tmp_path):
+    report = tmp_path / "report.xml"
+    report.write_text(JUNIT_XML, encoding="utf-8")
+    parser = TestResultParser("junit")
+    parser.parse(str(report))
+
+    with patch("utils.parser.os.stat", wraps=os.stat) as mock_stat:
+        result = parser.parse(str(report))
 
+    assert result.total == 3
+    mock_stat.assert_called_once_with(str(report))
+
+
+def test_parse_file_without_cache(tmp_path):
+    report = tmp_path / "report.xml"
+    report.write_text(JUNIT_XML, encoding="utf-8")
     parser = TestResultParser("junit")
-    result = parser.parse("fake_report.xml")
+
+    with patch("utils.parser._parse_file_cached") as mock_cached:
+        result = parser.parse(str(report), use_cache=False)
 
     assert result.total == 3
-    mock_et_parse.assert_called_once_with("fake_report.xml")
+    mock_cached.assert_not_called()
+
+
+def test_parse_file_cached_results_are_independent(tmp_path):
+    report = tmp_path / "report.xml"
+    report.write_text(JUNIT_XML, encoding="utf-8")
+    parser = TestResultParser("junit")
+
+    first = parser.parse(str(report))
+    first.test_cases.clear()
+
+    assert len(parser.parse(str(report)).test_cases) == 3
 
 
 def test_parse_xunit_string():
@@ -138,3 +165,38 @@ def test_parse_invalid_xml():
     parser = TestResultParser("junit")
     with pytest.raises(ET.ParseError):
         parser.parse("Not even XML")
+
+
+def test_get_parser_reuses_instance_per_format():
+    parser = get_parser("junit")
+
+    assert parser is get_parser("junit")
+    assert parser.report_type == "junit"
+    assert get_parser("xunit") is not parser
+
+
+def test_parse_junit_empty_time_is_zero():
+    xml = '<testsuite name="S"><testcase name="t" time="" /><testcase name="u" /></testsuite>'
+    result = TestResultParser("junit").parse(xml)
+
+    assert [tc.time for tc in result.test_cases] == [0.0, 0.0]
+
+
+def test_parse_junit_custom_root_counts_nested_suites_once():
+    # Only the outermost suites under a non-standard root are collected, so the
+    # nested suite and its test case are not counted a second time
+    xml = """<report>
+    <testsuite name="Outer" time="1.0">
+        <testcase name="outer case" time="0.5" />
+        <testsuite name="Inner" time="2.0">
+            <testcase name="inner case" time="0.5" />
+        </testsuite>
+    </testsuite>
+</report>"""
+    result = TestResultParser("junit").parse(xml)
+
+    assert result.total == 2
+    assert result.time == 1.0
+    assert [(tc.suite, tc.name) for tc in result.test_cases] == [
+        ("Outer", "outer case"), ("Outer", "inner case"),
+    ]
@@ -2,6 +2,7 @@ from typing import cast
 import pytest
 import os
 from pathlib import Path
+from unittest.mock import patch
 from utils.parser import TestResultParser, TestFormat
 from utils.dtos import TestResultSummary
 
@@ -443,3 +444,22 @@ class TestParserRealWorldScenarios:
             # Individual test times should be reasonable
             for test_case in result.test_cases:
                 assert 0 <= test_case.time < 10  # No single test should take more than 10 seconds
+
+    def test_parse_file_reparsed_after_change(self, junit_report_path, tmp_path):
+        """Test that repeated parses of a report are cached until the file changes."""
+        report = tmp_path / "report.xml"
+        report.write_text(Path(junit_report_path).read_text())
+
+        parser = TestResultParser("junit")
+        first = parser.parse(str(report))
+        with patch.object(TestResultParser, "_parse", side_effect=AssertionError("not cached")):
+            assert parser.parse(str(report)) == first
+
+        report.write_text(
+            '<testsuites><testsuite name="Only">'
+            '<testcase name="single" time="0.1" /></testsuite></testsuites>'
+        )
+        os.utime(report, ns=(0, 0))
+
+        second = parser.parse(str(report))
+        assert second.total == 1
@@ -1,16 +1,17 @@
 import pytest
+import subprocess
 from unittest.mock import patch, MagicMock
-from tools.run_tests import run_unittest, update_snapshot, _run_unittest_internal
+from tools.run_tests import run_unittest, update_snapshot, _run_unittest_internal, _HELM
 from utils.dtos import TestResultSummary
 
 
-@patch("tools.run_tests.TestResultParser")
+@patch("tools.run_tests.get_parser")
 @patch("tools.run_tests.subprocess.run")
 @patch("tools.run_tests.tempfile.mkstemp")
 @patch("tools.run_tests.os.close")
 @patch("tools.run_tests.os.remove")
 @patch("tools.run_tests.os.path.exists")
-def test_run_unittest_internal_success(mock_exists, mock_remove, mock_close, mock_mkstemp, mock_run, mock_parser_class):
+def test_run_unittest_internal_success(mock_exists, mock_remove, mock_close, mock_mkstemp, mock_run, mock_get_parser):
     # Setup mocks
     mock_mkstemp.return_value = (10, "/tmp/temp_report.xml")
     mock_exists.return_value = True
@@ -21,7 +22,7 @@ def test_run_unittest_internal_success(mock_exists, mock_remove, mock_close, moc
         total=1, passed=1, failed=0, skipped=0, errors=0, time=0.1, test_cases=[]
     )
     mock_parser_instance.parse.return_value = mock_summary
-    mock_parser_class.return_value = mock_parser_instance
+    mock_get_parser.return_value = mock_parser_instance
 
     # Execute
     result = _run_unittest_internal(
@@ -34,26 +35,28 @@ def test_run_unittest_internal_success(mock_exists, mock_remove, mock_close, moc
 
     # Verify command
     expected_cmd = [
-        "helm", "unittest", "-f", "tests/*.yaml", "./chart",
+        _HELM, "unittest", "-f", "tests/*.yaml", "./chart",
         "-t", "junit", "-o", "/tmp/temp_report.xml", "-u", "-v", "values.yaml"
     ]
-    mock_run.assert_called_once_with(expected_cmd, text=True, capture_output=True, check=False)
+    mock_run.assert_called_once_with(
+        expected_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False
+    )
 
     # Verify parser called
-    mock_parser_class.assert_called_once_with("junit")
-    mock_parser_instance.parse.assert_called_once_with("/tmp/temp_report.xml")
+    mock_get_parser.assert_called_once_with("junit")
+    mock_parser_instance.parse.assert_called_once_with("/tmp/temp_report.xml", use_cache=False)
 
     # Verify cleanup
     mock_remove.assert_called_once_with("/tmp/temp_report.xml")
     assert result == mock_summary
 
 
-@patch("tools.run_tests.TestResultParser")
+@patch("tools.run_tests.get_parser")
 @patch("tools.run_tests.subprocess.run")
-def test_run_unittest_with_provided_file(mock_run, mock_parser_class):
+def test_run_unittest_with_provided_file(mock_run, mock_get_parser):
     # Setup mocks
     mock_parser_instance = MagicMock()
-    mock_parser_class.return_value = mock_parser_instance
+    mock_get_parser.return_value = mock_parser_instance
 
     # Execute
     _run_unittest_internal(
@@ -67,6 +70,7 @@ def test_run_unittest_with_provided_file(mock_run, mock_parser_class):
     cmd = args[0]
     assert "-o" in cmd
     assert cmd[cmd.index("-o") + 1] == "custom_report.xml"
+    mock_parser_instance.parse.assert_called_once_with("custom_report.xml", use_cache=True)
 
     # Verify NO cleanup for provided file
     with patch("os.remove"):
@@ -86,12 +90,12 @@ def test_update_snapshot_tool(mock_internal):
     mock_internal.assert_called_once_with("files", "path", ["v1"], "junit", "out", update_snapshot=True)
 
 
-@patch("tools.run_tests.TestResultParser")
+@patch("tools.run_tests.get_parser")
 @patch("tools.run_tests.subprocess.run")
 @patch("tools.run_tests.os.close")
 @patch("tools.run_tests.os.path.exists")
 @patch("tools.run_tests.os.remove")
-def test_run_unittest_cleanup_on_error(mock_remove, mock_exists, mock_close, mock_run, mock_parser_class):
+def test_run_unittest_cleanup_on_error(mock_remove, mock_exists, mock_close, mock_run, mock_get_parser):
     # Test that cleanup happens even if parsing fails
     with patch("tools.run_tests.tempfile.mkstemp") as mock_mkstemp:
         mock_mkstemp.return_value = (10, "/tmp/temp.xml")
@@ -99,7 +103,7 @@ def test_run_unittest_cleanup_on_error(mock_remove, mock_exists, mock_close, moc
 
         mock_parser_instance = MagicMock()
         mock_parser_instance.parse.side_effect = Exception("Parse error")
-        mock_parser_class.return_value = mock_parser_instance
+        mock_get_parser.return_value = mock_parser_instance
 
         with pytest.raises(Exception, match="Parse error"):
             _run_unittest_internal("f", "p")
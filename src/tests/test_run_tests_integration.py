@@ -8,7 +8,6 @@ to verify the full execution flow from command generation to result parsing.
 import pytest
 import os
 import shutil
-import tempfile
 from pathlib import Path
 from tools.run_tests import run_unittest, update_snapshot
 from utils.dtos import TestResultSummary
@@ -18,7 +17,7 @@ from utils.dtos import TestResultSummary
 pytestmark = pytest.mark.integration
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def chart_path():
     """Fixture providing the path to the example Helm chart."""
     project_root = Path(__file__).parent.parent.parent
@@ -30,14 +29,33 @@ def chart_path():
     return str(path)
 
 
-@pytest.fixture
-def temp_chart(chart_path):
-    """Fixture providing a temporary copy of the example chart to allow modifications."""
-    temp_dir = tempfile.mkdtemp()
-    target_path = os.path.join(temp_dir, "example")
+@pytest.fixture(scope="session")
+def chart_template(chart_path, tmp_path_factory):
+    """Fixture providing a pristine copy of the example chart, built once per session."""
+    target_path = tmp_path_factory.mktemp("chart_template") / "example"
     shutil.copytree(chart_path, target_path)
-    yield target_path
-    shutil.rmtree(temp_dir)
+    return target_path
+
+
+def _link_or_copy(src, dst):
+    """Hardlink src to dst, falling back to a copy where links are not supported."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+@pytest.fixture
+def temp_chart(chart_template, tmp_path):
+    """Fixture providing a temporary copy of the example chart to allow modifications.
+
+    Files are hardlinked from the session template rather than copied. Tests
+    must replace files instead of rewriting them in place, so the template
+    stays pristine (update_snapshot writes snapshots into a fresh directory).
+    """
+    target_path = tmp_path / "example"
+    shutil.copytree(chart_template, target_path, copy_function=_link_or_copy)
+    return str(target_path)
 
 
 class TestRunTestsIntegration:
@@ -115,6 +133,9 @@ class TestRunTestsIntegration:
         # TestResultSummary doesn't have success attr normally, but its presence means it ran
         assert result.total >= 1
 
+        # Drop the generated snapshots now rather than keeping them until tmp_path cleanup
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+
     def test_run_unittest_nonexistent_chart(self):
         """Test running tests on a nonexistent chart path."""
         # helm unittest creates an empty valid report even when chart is missing
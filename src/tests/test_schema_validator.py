@@ -1,10 +1,21 @@
+import os
+import stat
+import threading
 import pytest
 import requests
+from types import SimpleNamespace
 from unittest.mock import patch, mock_open, MagicMock
-from tools.schema_validator import validate_schema, validate_tests, _get_schema
+from tools.schema_validator import (
+    validate_schema, validate_tests, _get_schema, _get_validator, _inline_refs, _result_cache,
+    _validate_schema,
+)
 from utils.dtos import ValidationResult
 
 
+# Stat results for mocking os.stat on a directory and on a regular file
+DIR_STAT = os.stat_result((stat.S_IFDIR | 0o755,) + (0,) * 9)
+FILE_STAT = os.stat_result((stat.S_IFREG | 0o644,) + (0,) * 9)
+
 # Sample Data
 MOCK_SCHEMA = {
     "type": "object",
@@ -27,8 +38,24 @@ suite: [
 """
 
 
+@pytest.fixture(autouse=True)
+def schema_cache_dir(tmp_path, monkeypatch):
+    """Give each test its own, initially empty, on-disk schema cache."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("tools.schema_validator._CACHE_DIR", cache_dir)
+    return cache_dir
+
+
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    """Keep validate_tests results from leaking between tests."""
+    _result_cache.clear()
+    yield
+    _result_cache.clear()
+
+
 def test_get_schema_success():
-    with patch("requests.get") as mock_get:
+    with patch("tools.schema_validator._session.get") as mock_get:
         mock_response = MagicMock()
         mock_response.json.return_value = MOCK_SCHEMA
         mock_response.raise_for_status.return_value = None
@@ -43,7 +70,7 @@ def test_get_schema_success():
 
 
 def test_get_schema_failure():
-    with patch("requests.get") as mock_get:
+    with patch("tools.schema_validator._session.get") as mock_get:
         mock_get.side_effect = requests.RequestException("Network error")
 
         _get_schema.cache_clear()
@@ -52,6 +79,150 @@ def test_get_schema_failure():
             _get_schema("http://example.com/schema.json")
 
 
+def test_get_schema_reads_disk_cache():
+    with patch("tools.schema_validator._session.get") as mock_get:
+        mock_response = MagicMock()
+        mock_response.json.return_value = MOCK_SCHEMA
+        mock_get.return_value = mock_response
+
+        _get_schema.cache_clear()
+        _get_schema("http://example.com/schema.json")
+
+        # A new process only has the disk cache to go by
+        _get_schema.cache_clear()
+        mock_get.side_effect = requests.RequestException("Network error")
+
+        assert _get_schema("http://example.com/schema.json") == MOCK_SCHEMA
+        mock_get.assert_called_once()
+
+
+def test_get_schema_refetches_expired_disk_cache(schema_cache_dir):
+    with patch("tools.schema_validator._session.get") as mock_get:
+        mock_response = MagicMock()
+        mock_response.json.return_value = MOCK_SCHEMA
+        mock_get.return_value = mock_response
+
+        _get_schema.cache_clear()
+        _get_schema("http://example.com/schema.json")
+        for cache_file in schema_cache_dir.iterdir():
+            os.utime(cache_file, (0, 0))
+
+        _get_schema.cache_clear()
+        _get_schema("http://example.com/schema.json")
+
+        assert mock_get.call_count == 2
+
+
+def test_get_schema_falls_back_to_expired_disk_cache(schema_cache_dir):
+    with patch("tools.schema_validator._session.get") as mock_get:
+        mock_response = MagicMock()
+        mock_response.json.return_value = MOCK_SCHEMA
+        mock_get.return_value = mock_response
+
+        _get_schema.cache_clear()
+        _get_schema("http://example.com/schema.json")
+        for cache_file in schema_cache_dir.iterdir():
+            os.utime(cache_file, (0, 0))
+
+        _get_schema.cache_clear()
+        mock_get.side_effect = requests.ConnectionError("Network error")
+        assert _get_schema("http://example.com/schema.json") == MOCK_SCHEMA
+
+        _get_schema.cache_clear()
+        server_error = MagicMock(status_code=503)
+        server_error.raise_for_status.side_effect = requests.HTTPError(response=server_error)
+        mock_get.side_effect = None
+        mock_get.return_value = server_error
+        assert _get_schema("http://example.com/schema.json") == MOCK_SCHEMA
+
+
+def test_get_schema_without_home_directory(monkeypatch):
+    monkeypatch.setattr("tools.schema_validator._CACHE_DIR", None)
+    monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    with patch("pathlib.Path.home", side_effect=RuntimeError("Could not determine home directory")), \
+            patch("tools.schema_validator._session.get") as mock_get:
+        mock_response = MagicMock()
+        mock_response.json.return_value = MOCK_SCHEMA
+        mock_get.return_value = mock_response
+
+        _get_schema.cache_clear()
+        assert _get_schema("http://example.com/schema.json") == MOCK_SCHEMA
+
+
+def test_get_schema_revalidates_expired_disk_cache_with_etag(schema_cache_dir):
+    with patch("tools.schema_validator._session.get") as mock_get:
+        mock_response = MagicMock()
+        mock_response.json.return_value = MOCK_SCHEMA
+        mock_response.headers = {"ETag": '"abc123"'}
+        mock_get.return_value = mock_response
+
+        _get_schema.cache_clear()
+        _get_schema("http://example.com/schema.json")
+        cache_file = next(schema_cache_dir.glob("*.json"))
+        os.utime(cache_file, (0, 0))
+
+        not_modified = MagicMock(status_code=304)
+        not_modified.json.side_effect = AssertionError("304 has no body")
+        mock_get.return_value = not_modified
+
+        _get_schema.cache_clear()
+        assert _get_schema("http://example.com/schema.json") == MOCK_SCHEMA
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"abc123"'}
+
+        # The revalidated copy is fresh again
+        assert cache_file.stat().st_mtime > 0
+
+
+def test_get_validator_reused_per_schema_object():
+    validator = _get_validator(MOCK_SCHEMA)
+
+    assert _get_validator(MOCK_SCHEMA) is validator
+    assert _get_validator(dict(MOCK_SCHEMA)) is not validator
+
+
+REF_SCHEMA: dict = {
+    "definitions": {
+        "test": {"type": "object", "required": ["it"], "properties": {"it": {"type": "string"}}},
+        "node": {"type": "object", "properties": {"children": {"type": "array", "items": {"$ref": "#/definitions/node"}}}},
+    },
+    "type": "object",
+    "properties": {
+        "tests": {"type": "array", "items": {"$ref": "#/definitions/test"}},
+        "tree": {"$ref": "#/definitions/node"},
+        "extended": {"$ref": "#/definitions/test", "description": "not inlined, $ref has siblings"},
+        "missing": {"$ref": "#/definitions/missing"},
+        "example": {"default": {"$ref": "#/definitions/test"}},
+    },
+}
+
+
+def test_inline_refs():
+    inlined = _inline_refs(REF_SCHEMA)
+    properties = inlined["properties"]
+
+    assert properties["tests"]["items"] == REF_SCHEMA["definitions"]["test"]
+    # Recursive references stay in place one level down
+    assert properties["tree"]["properties"]["children"]["items"] == {"$ref": "#/definitions/node"}
+    assert properties["extended"] == REF_SCHEMA["properties"]["extended"]
+    assert properties["missing"] == {"$ref": "#/definitions/missing"}
+    assert properties["example"] == {"default": {"$ref": "#/definitions/test"}}
+    # The original schema is left untouched
+    assert REF_SCHEMA["properties"]["tests"]["items"] == {"$ref": "#/definitions/test"}
+
+
+def test_inline_refs_skips_schemas_with_nested_ids():
+    schema = {"definitions": {"test": {"$id": "https://example.com/test"}}, "$ref": "#/definitions/test"}
+
+    assert _inline_refs(schema) is schema
+
+
+def test_get_validator_reports_errors_through_inlined_refs():
+    validator = _get_validator(REF_SCHEMA)
+    errors = list(validator.iter_errors({"tests": [{"it": 1}], "tree": {"children": [{"children": 1}]}}))
+
+    assert sorted(list(error.path) for error in errors) == [["tests", 0, "it"], ["tree", "children", 0, "children"]]
+
+
 @patch("tools.schema_validator._get_schema")
 @patch("pathlib.Path.exists")
 @patch("builtins.open", new_callable=mock_open, read_data=VALID_YAML)
@@ -93,6 +264,17 @@ def test_validate_schema_invalid_yaml(mock_file, mock_exists, mock_get_schema):
     assert any("YAML parsing error" in err for err in result.errors)
 
 
+@patch("tools.schema_validator._get_schema", return_value=MOCK_SCHEMA)
+def test_validate_schema_invalid_yaml_names_file(mock_get_schema, tmp_path):
+    test_file = tmp_path / "malformed.yaml"
+    test_file.write_text(MALFORMED_YAML)
+
+    result = validate_schema(str(test_file))
+
+    assert result.success is False
+    assert any(str(test_file) in err for err in result.errors)
+
+
 @patch("tools.schema_validator._get_schema")
 def test_validate_schema_network_error(mock_get_schema):
     mock_get_schema.side_effect = requests.RequestException("Connection failed")
@@ -119,45 +301,166 @@ def test_validate_schema_validation_error(mock_file, mock_exists, mock_get_schem
     assert any("Validation error" in err for err in result.errors)
 
 
-@patch("os.path.exists")
-@patch("os.path.isdir")
-@patch("os.walk")
-@patch("tools.schema_validator.validate_schema")
-def test_validate_tests_success(mock_validate, mock_walk, mock_isdir, mock_exists):
-    mock_exists.return_value = True
-    mock_isdir.return_value = True
-    mock_walk.return_value = [
-        ("/root", [], ["test1.yaml", "test2.yaml", "readme.md"])
+@patch("tools.schema_validator._get_schema", return_value=MOCK_SCHEMA)
+@patch("tools.schema_validator.iter_test_files")
+@patch("tools.schema_validator._validate_schema")
+def test_validate_tests_success(mock_validate, mock_iter_files, mock_get_schema):
+    # The walk yields test2 before test1, so sorting would change the result
+    mock_iter_files.return_value = [
+        SimpleNamespace(path="/root/test2.yaml", name="test2.yaml"),
+        SimpleNamespace(path="/root/test1.yaml", name="test1.yaml"),
     ]
 
-    mock_validate.side_effect = [
-        ValidationResult(success=True, message="OK"),
-        ValidationResult(success=False, message="Fail", errors=["Err"])
-    ]
+    validation_results = {
+        "/root/test1.yaml": ValidationResult(success=True, message="OK"),
+        "/root/test2.yaml": ValidationResult(success=False, message="Fail", errors=["Err"])
+    }
+
+    # Finish the first file only once the second is done, results must still follow walk order
+    second_done = threading.Event()
+
+    def validate(path):
+        if path == "/root/test2.yaml":
+            assert second_done.wait(timeout=5)
+        else:
+            second_done.set()
+        return validation_results[path], True
+    mock_validate.side_effect = validate
 
     results = validate_tests("/root")
 
-    assert len(results) == 2
-    assert results[0].success is True
-    assert results[1].success is False
+    assert results == [validation_results["/root/test2.yaml"], validation_results["/root/test1.yaml"]]
     assert mock_validate.call_count == 2
+    mock_iter_files.assert_called_once_with("/root", "")
 
 
-@patch("os.path.exists")
-@patch("os.path.isdir")
-def test_validate_tests_invalid_dir(mock_isdir, mock_exists):
-    mock_exists.return_value = False
+@patch("tools.schema_validator._get_schema", return_value=MOCK_SCHEMA)
+@patch("tools.schema_validator._validate_schema")
+def test_validate_tests_walks_subdirectories(mock_validate, mock_get_schema, tmp_path):
+    (tmp_path / "nested" / "deeper").mkdir(parents=True)
+    (tmp_path / "top.yaml").write_text(VALID_YAML)
+    (tmp_path / "nested" / "deeper" / "inner.yaml").write_text(VALID_YAML)
+    mock_validate.side_effect = lambda path: (ValidationResult(success=True, message=path), True)
+
+    results = validate_tests(str(tmp_path))
+
+    assert sorted(result.message for result in results) == [
+        str(tmp_path / "nested" / "deeper" / "inner.yaml"),
+        str(tmp_path / "top.yaml"),
+    ]
+
+
+@patch("tools.schema_validator._get_schema")
+@patch("tools.schema_validator._validate_schema")
+def test_validate_tests_builds_validator_before_validating(mock_validate, mock_get_schema, tmp_path):
+    # A schema object no validator has been built for yet
+    schema = dict(MOCK_SCHEMA)
+    mock_get_schema.return_value = schema
+    for name in ("a.yaml", "b.yaml", "c.yaml"):
+        (tmp_path / name).write_text(VALID_YAML)
+
+    def validate(path):
+        with patch("tools.schema_validator.validator_for", side_effect=AssertionError("built in a worker")):
+            _get_validator(schema)
+        return ValidationResult(success=True, message="OK"), True
+    mock_validate.side_effect = validate
+
+    results = validate_tests(str(tmp_path))
+
+    assert [result.success for result in results] == [True, True, True]
+
+
+@patch("os.stat")
+def test_validate_tests_invalid_dir(mock_stat):
+    mock_stat.side_effect = FileNotFoundError
     with pytest.raises(FileNotFoundError):
         validate_tests("/invalid")
 
-    mock_exists.return_value = True
-    mock_isdir.return_value = False
+    mock_stat.side_effect = None
+    mock_stat.return_value = FILE_STAT
     with pytest.raises(NotADirectoryError):
         validate_tests("/not_a_dir")
 
 
 def test_validate_tests_invalid_pattern():
-    with patch("os.path.exists", return_value=True), \
-         patch("os.path.isdir", return_value=True):
+    with patch("os.stat", return_value=DIR_STAT):
         with pytest.raises(ValueError, match="Invalid regex pattern"):
             validate_tests("/root", pattern="[invalid")
+
+
+@patch("tools.schema_validator._get_schema", return_value=MOCK_SCHEMA)
+@patch("tools.schema_validator._validate_schema")
+def test_validate_tests_reuses_results_of_unchanged_files(mock_validate, mock_get_schema, tmp_path):
+    test_file = tmp_path / "test.yaml"
+    test_file.write_text(VALID_YAML)
+    mock_validate.return_value = (ValidationResult(success=True, message="OK"), True)
+
+    validate_tests(str(tmp_path))
+    validate_tests(str(tmp_path))
+    assert mock_validate.call_count == 1
+
+    test_file.write_text(INVALID_YAML)
+    validate_tests(str(tmp_path))
+    assert mock_validate.call_count == 2
+
+    # A different schema invalidates every cached result
+    mock_get_schema.return_value = dict(MOCK_SCHEMA)
+    validate_tests(str(tmp_path))
+    assert mock_validate.call_count == 3
+
+
+@patch("tools.schema_validator._get_schema", return_value=MOCK_SCHEMA)
+@patch("tools.schema_validator._validate_schema")
+def test_validate_tests_cached_results_are_independent(mock_validate, mock_get_schema, tmp_path):
+    (tmp_path / "test.yaml").write_text(INVALID_YAML)
+    mock_validate.return_value = (ValidationResult(success=False, message="Fail", errors=["Err"]), True)
+
+    validate_tests(str(tmp_path))[0].errors.clear()
+    second = validate_tests(str(tmp_path))[0]
+    second.errors.append("Other")
+    third = validate_tests(str(tmp_path))[0]
+
+    assert third.errors == ["Err"]
+    assert mock_validate.call_count == 1
+
+
+@patch("tools.schema_validator._get_schema", return_value=MOCK_SCHEMA)
+@patch("tools.schema_validator._validate_schema")
+def test_validate_tests_does_not_reuse_transient_failures(mock_validate, mock_get_schema, tmp_path):
+    (tmp_path / "test.yaml").write_text(VALID_YAML)
+    mock_validate.return_value = (
+        ValidationResult(success=False, message="Unexpected error during validation", errors=["Error: denied"]),
+        False,
+    )
+
+    validate_tests(str(tmp_path))
+    mock_validate.return_value = (ValidationResult(success=True, message="OK"), True)
+    results = validate_tests(str(tmp_path))
+
+    assert results[0].success is True
+    assert mock_validate.call_count == 2
+
+
+@patch("tools.schema_validator._get_schema", return_value=MOCK_SCHEMA)
+@patch("builtins.open", side_effect=PermissionError("Permission denied"))
+def test_validate_schema_unreadable_file_not_cacheable(mock_file, mock_get_schema, tmp_path):
+    test_file = tmp_path / "test.yaml"
+    test_file.write_text(VALID_YAML)
+
+    result, cacheable = _validate_schema(str(test_file))
+
+    assert result.success is False
+    assert cacheable is False
+
+
+@patch("tools.schema_validator._get_schema", return_value=MOCK_SCHEMA)
+@patch("tools.schema_validator._validate_schema")
+def test_validate_tests_result_cache_is_bounded(mock_validate, mock_get_schema, tmp_path, monkeypatch):
+    monkeypatch.setattr("tools.schema_validator._RESULT_CACHE_SIZE", 2)
+    for name in ("a.yaml", "b.yaml", "c.yaml"):
+        (tmp_path / name).write_text(VALID_YAML)
+    mock_validate.return_value = (ValidationResult(success=True, message="OK"), True)
+
+    validate_tests(str(tmp_path))
+
+    assert len(_result_cache) == 2
@@ -1,12 +1,36 @@
-from tools.get_tests import get_tests, get_test_from_file
-from tools.run_tests import run_unittest, update_snapshot
-from tools.schema_validator import validate_tests, validate_schema
+from importlib import import_module
+from typing import Any
+
+# tools.get_tests is imported eagerly: its module and function share a name, and
+# a lazily bound function would be shadowed once the submodule is imported.
+from tools.get_tests import get_tests, get_test_from_file, iter_tests
+
+# The other tools are imported on first access (PEP 562), so importing
+# tools.get_tests does not pull in requests and jsonschema. `from tools import *`
+# still resolves every name in __all__ and so registers every tool.
+_LAZY_EXPORTS = {
+    "run_unittest": "tools.run_tests",
+    "update_snapshot": "tools.run_tests",
+    "validate_tests": "tools.schema_validator",
+    "validate_schema": "tools.schema_validator",
+}
 
 __all__ = [
     "get_tests",
     "get_test_from_file",
+    "iter_tests",
     "run_unittest",
     "update_snapshot",
     "validate_tests",
     "validate_schema",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a lazily exported tool on first access."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -1,14 +1,154 @@
 # The mcp instance is injected by server.py before this module is loaded
+import io
 import os
-import re
+import copy
+import json
 import yaml
+from collections import deque
+from dataclasses import replace
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from yaml.nodes import MappingNode, Node, ScalarNode, SequenceNode
 from utils.mcp import Server
 from utils.dtos import TestFile
-from typing import Optional
+from utils.files import MAX_WORKERS, YamlLoader, iter_test_files
+from typing import Any, Iterator, Optional
 
 
 mcp = Server().mcp
 
+# Tags the resolver gives plain string scalars, such as mapping keys, and
+# untagged mappings and sequences
+_STR_TAG = 'tag:yaml.org,2002:str'
+_MAP_TAG = 'tag:yaml.org,2002:map'
+_SEQ_TAG = 'tag:yaml.org,2002:seq'
+
+# Directories that never contain test suites and are not descended into
+_SKIPPED_DIRS = frozenset({"__snapshot__", ".git", "node_modules"})
+
+
+# Placeholder for a `tests` entry that has no `it` key
+_MISSING_NAME: Any = object()
+
+
+class _InvalidTest:
+    """Placeholder for a `tests` entry that is not a mapping, keeping its type for error messages."""
+    __slots__ = ("type_name",)
+
+    def __init__(self, value: Any) -> None:
+        self.type_name = type(value).__name__
+
+
+def _json_float(text: str) -> float:
+    """parse_float for the JSON fast path, accepting only floats YAML resolves as such.
+
+    PyYAML reads a number as a float only if it has a `.` and its exponent,
+    if any, has a sign; `1e3` or `1.5e3` stay strings. Anything else raises
+    ValueError, so the buffer is loaded by the YAML loader instead.
+    """
+    mantissa, has_exponent, exponent = text.lower().partition('e')
+    if '.' not in mantissa or (has_exponent and exponent[:1] not in ('+', '-')):
+        raise ValueError(f"{text} is not a YAML float")
+    return float(text)
+
+
+def _json_constant(name: str) -> Any:
+    """parse_constant for the JSON fast path: NaN and Infinity are strings in YAML."""
+    raise ValueError(f"{name} is not valid JSON")
+
+
+def _load_test_document(stream: Any, name: Optional[str] = None) -> Any:
+    """Load a test file, constructing only the fields TestFile is built from.
+
+    The loader composes the whole document into nodes, but only `suite`,
+    `release` and the `it` of each test are turned into Python objects, so
+    large `asserts` blocks and other keys are never constructed. `tests` is
+    returned as the list of those `it` values (_MISSING_NAME for entries
+    without one, an _InvalidTest for entries that are not mappings).
+    A document without the usual shape (not a plain mapping, or `tests` not
+    a plain sequence) is constructed unchanged so that validation reports it exactly
+    as before.
+
+    A buffer that looks like a JSON object is first tried with the much faster
+    json parser, falling back to YAML. Numbers the two read differently, such
+    as `1e3` or `NaN` (strings in YAML), also fall back to YAML. When
+    name is given, YAML error marks refer to it instead of "<byte string>".
+    """
+    if isinstance(stream, bytes) and stream.lstrip()[:1] == b'{':
+        try:
+            json_document = json.loads(stream, parse_float=_json_float, parse_constant=_json_constant)
+        except ValueError:
+            pass
+        else:
+            if isinstance(json_document, dict) and isinstance(json_document.get('tests'), list):
+                json_document['tests'] = [
+                    test.get('it', _MISSING_NAME) if isinstance(test, dict) else _InvalidTest(test)
+                    for test in json_document['tests']
+                ]
+            return json_document
+
+    if name is not None and isinstance(stream, (bytes, str)):
+        # A named stream over the buffer keeps the file name in YAML error marks
+        buffer: Any = io.BytesIO(stream) if isinstance(stream, bytes) else io.StringIO(stream)
+        buffer.name = name
+        stream = buffer
+
+    loader = YamlLoader(stream)
+    try:
+        node = loader.get_single_node()
+        if node is None:
+            return None
+        if not isinstance(node, MappingNode) or node.tag != _MAP_TAG:
+            # Tagged mappings such as !!set are constructed as such
+            return loader.construct_document(node)
+
+        document: dict[str, Any] = {}
+        for key_node, value_node in _mapping_items(loader, node):
+            key = key_node.value
+            if key == 'tests' and isinstance(value_node, SequenceNode) and value_node.tag == _SEQ_TAG:
+                # Collect the test names directly instead of one dict per test
+                document[key] = [_construct_test_name(loader, item) for item in value_node.value]
+            elif key in ('suite', 'tests', 'release'):
+                document[key] = loader.construct_object(value_node, deep=True)
+        return document
+    finally:
+        loader.dispose()
+
+
+def _mapping_items(loader: Any, node: MappingNode) -> Iterator[tuple[Node, Node]]:
+    """Yield the (key, value) nodes of a mapping that have plain string keys."""
+    # Resolve `<<` merge keys the same way the constructor would
+    loader.flatten_mapping(node)
+    for key_node, value_node in node.value:
+        if isinstance(key_node, ScalarNode) and key_node.tag == _STR_TAG:
+            yield key_node, value_node
+
+
+def _construct_test_name(loader: Any, node: Node) -> Any:
+    """Construct the `it` value of a single `tests` entry, or _MISSING_NAME if it has none.
+
+    Entries that are not plain mappings, including tagged ones such as
+    !!set, are returned as an _InvalidTest.
+    """
+    if not isinstance(node, MappingNode) or node.tag != _MAP_TAG:
+        return _InvalidTest(loader.construct_object(node, deep=True))
+    name = _MISSING_NAME
+    for key_node, value_node in _mapping_items(loader, node):
+        if key_node.value == 'it':
+            name = loader.construct_object(value_node, deep=True)
+    return name
+
+
+def _load_test_file(file_path: str) -> Optional[TestFile]:
+    """Parse a test file for get_tests, returning None if it cannot be parsed."""
+    try:
+        return get_test_from_file(file_path)
+    except Exception as e:
+        # Log the error but continue processing other files
+        # This allows get_tests to be resilient to individual file errors
+        print(f"Warning: Failed to parse {file_path}: {e}")
+        return None
+
 
 @mcp.tool()
 def get_tests(dir_path: str, pattern: Optional[str] = "") -> list[TestFile]:
@@ -27,51 +167,53 @@ def get_tests(dir_path: str, pattern: Optional[str] = "") -> list[TestFile]:
         FileNotFoundError: If the directory doesn't exist
         NotADirectoryError: If dir_path is not a directory
     """
-    # Validate input
-    if not dir_path:
-        raise ValueError("dir_path cannot be empty")
+    return list(iter_tests(dir_path, pattern))
 
-    if not isinstance(dir_path, str):
-        raise TypeError(f"dir_path must be a string, got {type(dir_path).__name__}")
 
-    # Check if directory exists
-    if not os.path.exists(dir_path):
-        raise FileNotFoundError(f"Directory not found: {dir_path}")
+def iter_tests(dir_path: str, pattern: Optional[str] = "") -> Iterator[TestFile]:
+    """Lazily yield the test files from a directory and its subdirectories.
 
-    if not os.path.isdir(dir_path):
-        raise NotADirectoryError(f"Path is not a directory: {dir_path}")
+    Streaming variant of get_tests: files are parsed in the background while
+    the directory is still being walked and results are yielded in walk order
+    as soon as they are ready, so memory stays bounded however large the
+    chart is. The arguments are validated immediately, not on first iteration.
 
-    # Determine the pattern to use
-    if pattern is None or pattern.strip() == "":
-        # Default pattern: match all .yaml files
-        file_pattern = re.compile(r".*\.yaml$", re.IGNORECASE)
-    else:
-        # Use the provided regex pattern
-        try:
-            file_pattern = re.compile(pattern)
-        except re.error as e:
-            raise ValueError(f"Invalid regex pattern '{pattern}': {e}")
+    Args:
+        dir_path: Path to the directory to search for test files
+        pattern: Optional regex pattern to filter files. If empty or None,
+                matches all .yaml files. Otherwise, uses the provided regex pattern.
+
+    Returns:
+        Iterator of TestFile objects parsed from matching files
+
+    Raises:
+        ValueError: If dir_path is empty or not a string
+        FileNotFoundError: If the directory doesn't exist
+        NotADirectoryError: If dir_path is not a directory
+    """
+    # iter_test_files validates the arguments now and walks the directory lazily
+    return _iter_parsed_files(iter_test_files(dir_path, pattern, _SKIPPED_DIRS))
 
-    test_files = []
 
-    # Recursively walk through directory
-    for root, dirs, files in os.walk(dir_path):
-        for filename in files:
-            # Check if filename matches the pattern
-            if file_pattern.match(filename):
-                file_path = os.path.join(root, filename)
+def _iter_parsed_files(entries: Iterator[os.DirEntry[str]]) -> Iterator[TestFile]:
+    """Parse the given files concurrently, yielding in the order they were found."""
+    # Bound the number of files in flight so results never pile up in memory
+    max_pending = MAX_WORKERS * 2
+    pending: deque[Future[Optional[TestFile]]] = deque()
 
-                # Try to parse the file
-                try:
-                    test_file = get_test_from_file(file_path)
-                    test_files.append(test_file)
-                except Exception as e:
-                    # Log the error but continue processing other files
-                    # This allows the function to be resilient to individual file errors
-                    print(f"Warning: Failed to parse {file_path}: {e}")
-                    continue
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for entry in entries:
+            pending.append(executor.submit(_load_test_file, entry.path))
+            if len(pending) < max_pending:
+                continue
+            test_file = pending.popleft().result()
+            if test_file is not None:
+                yield test_file
 
-    return test_files
+        while pending:
+            test_file = pending.popleft().result()
+            if test_file is not None:
+                yield test_file
 
 
 @mcp.tool()
@@ -87,7 +229,10 @@ def get_test_from_file(test_file_path: str) -> TestFile:
     Raises:
         FileNotFoundError: If the test file doesn't exist
         PermissionError: If the file cannot be read due to permissions
-        yaml.YAMLError: If the file contains invalid YAML
+        yaml.YAMLError: If the file contains invalid YAML. Only `suite`,
+            `release` and the test names are constructed, so a value that
+            cannot be constructed elsewhere, such as an unknown tag in
+            `asserts`, is not reported; validate_schema still reports it.
         KeyError: If required fields are missing from the test file
         TypeError: If field values have incorrect types
         ValueError: If field values are invalid
@@ -99,10 +244,33 @@ def get_test_from_file(test_file_path: str) -> TestFile:
     if not isinstance(test_file_path, str):
         raise TypeError(f"test_file_path must be a string, got {type(test_file_path).__name__}")
 
+    # Reuse the previous result while the file is unchanged
+    try:
+        st = os.stat(test_file_path)
+    except OSError:
+        # Let the parser report missing or unreadable files
+        return _parse_test_file(test_file_path)
+
+    test_file = _parse_test_file_cached(test_file_path, st.st_mtime_ns, st.st_size)
+    # Hand out a copy, so that callers changing their result cannot alter the cached one
+    return replace(test_file, tests=list(test_file.tests), release=copy.deepcopy(test_file.release))
+
+
+@lru_cache(maxsize=4096)
+def _parse_test_file_cached(test_file_path: str, mtime_ns: int, size: int) -> TestFile:
+    """Parse a test file, caching the result by path and stat fingerprint."""
+    return _parse_test_file(test_file_path)
+
+
+def _parse_test_file(test_file_path: str) -> TestFile:
+    """Read, parse and validate a test file. See get_test_from_file."""
     # Read and parse the file
     try:
-        with open(test_file_path, 'r') as f:
-            tests = yaml.safe_load(f)
+        # Test files are small: one read, then let libyaml parse the buffer
+        with open(test_file_path, 'rb') as f:
+            data = f.read()
+        # Blank files are reported as empty below without starting a parser
+        tests = None if not data or data.isspace() else _load_test_document(data, test_file_path)
     except FileNotFoundError:
         raise FileNotFoundError(
             f"Test file not found: {test_file_path}. "
@@ -170,11 +338,29 @@ def get_test_from_file(test_file_path: str) -> TestFile:
             f"Field 'tests' cannot be an empty list in {test_file_path}"
         )
 
+    # Every test needs a string name; only look for the culprit if one is missing
+    strip = str.strip
+    try:
+        test_names = [strip(name) for name in test_list]
+    except TypeError:
+        index, name = next((i, name) for i, name in enumerate(test_list) if not isinstance(name, str))
+        if name is _MISSING_NAME:
+            raise ValueError(f"Test #{index + 1} in {test_file_path} is missing the 'it' field")
+        if isinstance(name, _InvalidTest):
+            raise ValueError(
+                f"Test #{index + 1} in {test_file_path} must be a mapping with a string 'it' field, "
+                f"got {name.type_name}"
+            )
+        raise ValueError(
+            f"Test #{index + 1} in {test_file_path} must have a string 'it' field, "
+            f"got {type(name).__name__}"
+        )
+
     # Create and return TestFile object
     try:
         return TestFile(
             suite=suite,
-            tests=[x.get('it').strip() for x in test_list],
+            tests=test_names,
             release=tests.get('release', {}),
             file_path=test_file_path
         )
@@ -1,14 +1,19 @@
+import shutil
 import subprocess
 import tempfile
 import os
 from typing import Optional, cast
 from utils.mcp import Server
-from utils.parser import TestResultParser, TestFormat
+from utils.parser import get_parser, TestFormat
 from utils.dtos import TestResultSummary
 
 
 mcp = Server().mcp
 
+# Resolve helm on PATH once rather than on every run; fall back to the bare
+# name so a missing binary still fails when the tests are run.
+_HELM = shutil.which("helm") or "helm"
+
 
 def _run_unittest_internal(
     test_suite_files: str,
@@ -25,7 +30,7 @@ def _run_unittest_internal(
         os.close(fd)
         is_temp = True
 
-    cmd = ["helm", "unittest", "-f", test_suite_files, chart_path, "-t", output_type, "-o", output_file]
+    cmd = [_HELM, "unittest", "-f", test_suite_files, chart_path, "-t", output_type, "-o", output_file]
     if update_snapshot:
         cmd.append("-u")
 
@@ -33,12 +38,13 @@ def _run_unittest_internal(
         cmd.append("-v")
         cmd.append(v)
 
-    # Run the tests
-    subprocess.run(cmd, text=True, capture_output=True, check=False)
+    # Run the tests; results are read from the report, so the console output is discarded
+    subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
 
     try:
-        parser = TestResultParser(cast(TestFormat, output_type))
-        return parser.parse(output_file)
+        parser = get_parser(cast(TestFormat, output_type))
+        # A temporary report is deleted right away, so caching it could never pay off
+        return parser.parse(output_file, use_cache=not is_temp)
     finally:
         # Cleanup temporary file if we created one
         if is_temp and os.path.exists(output_file):
@@ -1,12 +1,23 @@
 import os
-import re
+import json
+import time
+import hashlib
+import tempfile
 import yaml
 import requests
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
+from jsonschema.exceptions import best_match
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from pathlib import Path
-from typing import Optional
+from threading import Lock
+from typing import Any, Optional
 from utils.mcp import Server
 from utils.dtos import ValidationResult
+from utils.files import MAX_WORKERS, YamlLoader, iter_test_files
 
 from functools import lru_cache
 
@@ -14,13 +25,237 @@ from functools import lru_cache
 mcp = Server().mcp
 schema_url = "https://raw.githubusercontent.com/helm-unittest/helm-unittest/refs/heads/main/schema/helm-testsuite.json"
 
+# Downloaded schemas are also kept on disk, so a new server process can skip the fetch.
+# The location is worked out on first use; setting _CACHE_DIR overrides it.
+_CACHE_DIR: Optional[Path] = None
+_CACHE_TTL = 24 * 60 * 60
+
+# Serializes schema downloads, so concurrent first calls share one fetch
+_schema_lock = Lock()
+
+# Shared by schema downloads, so a revalidation or refetch reuses the open connection
+_session = requests.Session()
+
+# Last result per test file path, (st_mtime_ns, st_size, schema, result), least recently used first
+_result_cache: OrderedDict[str, tuple[int, int, dict, ValidationResult]] = OrderedDict()
+_result_cache_lock = Lock()
+_RESULT_CACHE_SIZE = 4096
+
+
+def _schema_cache_file(url: str) -> Optional[Path]:
+    """Return the on-disk cache location of the schema at url.
+
+    Returns None when there is no cache directory to use, for instance when
+    the process has neither HOME nor a passwd entry; the schema is then only
+    cached in memory.
+    """
+    cache_dir = _CACHE_DIR
+    if cache_dir is None:
+        try:
+            xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+            cache_dir = Path(xdg_cache_home or Path.home() / ".cache") / "helm-unittest-mcp"
+        except (RuntimeError, KeyError, OSError):
+            return None
+    return cache_dir / f"schema-{hashlib.sha256(url.encode()).hexdigest()[:16]}.json"
+
+
+def _read_cached_schema(cache_file: Path, max_age: Optional[float] = _CACHE_TTL) -> Optional[dict]:
+    """Load a cached schema if it is younger than max_age seconds, otherwise return None.
+
+    A max_age of None accepts a cached schema of any age.
+    """
+    try:
+        if max_age is not None and time.time() - cache_file.stat().st_mtime > max_age:
+            return None
+        with open(cache_file, 'rb') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _read_cached_etag(cache_file: Path) -> Optional[str]:
+    """Return the ETag stored next to a cached schema, if any."""
+    try:
+        return cache_file.with_suffix(".etag").read_text(encoding='utf-8').strip() or None
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path: Path, data: str) -> None:
+    """Replace path with data so that readers never see a partially written file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _write_cached_schema(cache_file: Path, schema: dict, etag: Optional[str] = None) -> None:
+    """Store a schema and its ETag on disk. Failures are ignored, the cache is optional."""
+    etag_file = cache_file.with_suffix(".etag")
+    try:
+        # Drop the old ETag first, so it can never be paired with a newer schema
+        etag_file.unlink(missing_ok=True)
+        _write_atomic(cache_file, json.dumps(schema))
+        if isinstance(etag, str) and etag:
+            _write_atomic(etag_file, etag)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def _fetch_schema(url: str, cache_file: Optional[Path]) -> dict:
+    """Download the schema, revalidating the cached copy with its ETag if there is one."""
+    etag = _read_cached_etag(cache_file) if cache_file is not None else None
+    if cache_file is not None and etag is not None:
+        response = _session.get(url, headers={"If-None-Match": etag}, timeout=10)
+        if response.status_code == 304:
+            schema = _read_cached_schema(cache_file, max_age=None)
+            if schema is not None:
+                try:
+                    os.utime(cache_file)
+                except OSError:
+                    pass
+                return schema
+            # The cached copy disappeared meanwhile; download it unconditionally
+            response = _session.get(url, timeout=10)
+    else:
+        response = _session.get(url, timeout=10)
+
+    response.raise_for_status()
+    schema = response.json()
+    if cache_file is not None:
+        _write_cached_schema(cache_file, schema, response.headers.get("ETag"))
+    return schema
+
 
 @lru_cache(maxsize=1)
 def _get_schema(url: str) -> dict:
-    """Fetch and parse the JSON schema from the provided URL with caching."""
-    response = requests.get(url, timeout=10)
-    response.raise_for_status()
-    return response.json()
+    """Fetch and parse the JSON schema from the provided URL with caching.
+
+    The schema is cached in memory for the life of the process and on disk
+    for a day, so restarting the server does not download it again. Once the
+    disk copy is older than that it is revalidated with its ETag, and kept for
+    another day if the server answers 304 Not Modified. If the server cannot
+    be reached or fails with a 5xx error, the expired copy is used instead.
+    """
+    cache_file = _schema_cache_file(url)
+    with _schema_lock:
+        # Callers that waited on the lock find the schema the first one stored
+        if cache_file is not None:
+            schema = _read_cached_schema(cache_file)
+            if schema is not None:
+                return schema
+
+        try:
+            return _fetch_schema(url, cache_file)
+        except requests.RequestException as e:
+            # A client error means the URL itself is wrong, which a stale copy would hide
+            response = getattr(e, "response", None)
+            if isinstance(e, requests.HTTPError) and response is not None and response.status_code < 500:
+                raise
+            stale_schema = _read_cached_schema(cache_file, max_age=None) if cache_file is not None else None
+            if stale_schema is None:
+                raise
+            return stale_schema
+
+
+# Keywords whose values are instance data rather than subschemas
+_DATA_KEYWORDS = frozenset({"const", "default", "enum", "examples"})
+
+# Keywords that change the base URI or the dynamic scope of the subschema declaring them
+_SCOPE_KEYWORDS = frozenset({"$id", "id", "$anchor", "$dynamicAnchor", "$recursiveAnchor"})
+
+
+def _declares_scope(node: Any, is_root: bool = True) -> bool:
+    """Return True if a subschema below the root declares an $id or an anchor."""
+    if isinstance(node, dict):
+        return any(
+            (not is_root and key in _SCOPE_KEYWORDS and not isinstance(value, (dict, list)))
+            or (key not in _DATA_KEYWORDS and _declares_scope(value, False))
+            for key, value in node.items()
+        )
+    if isinstance(node, list):
+        return any(_declares_scope(item, False) for item in node)
+    return False
+
+
+def _resolve_pointer(document: Any, pointer: str) -> Any:
+    """Resolve a JSON pointer such as "/definitions/test" within document.
+
+    Raises:
+        LookupError: If the pointer does not lead to a value
+    """
+    node = document
+    for token in pointer.split("/")[1:]:
+        token = token.replace("~1", "/").replace("~0", "~")
+        node = node[int(token)] if isinstance(node, list) else node[token]
+    return node
+
+
+def _inline_refs(schema: dict) -> dict:
+    """Return a copy of schema with its local $refs replaced by their targets.
+
+    jsonschema resolves a $ref on every visit, which makes up a large share of
+    validation time for a schema built from shared definitions. Only plain
+    {"$ref": "#/..."} nodes without sibling keywords are inlined, references
+    that would expand into themselves are left in place and the definitions
+    are kept, so the result validates exactly like the original. Schemas that
+    declare nested $ids or anchors are returned unchanged.
+    """
+    if _declares_scope(schema):
+        return schema
+
+    resolved: dict[str, Any] = {}
+    expanding: set[str] = set()
+
+    def inline(node: Any) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if (len(node) == 1 and isinstance(ref, str) and ref.startswith("#/")
+                    and "%" not in ref and ref not in expanding):
+                if ref not in resolved:
+                    try:
+                        target = _resolve_pointer(schema, ref[1:])
+                    except (LookupError, TypeError, ValueError):
+                        return node
+                    expanding.add(ref)
+                    try:
+                        resolved[ref] = inline(target)
+                    finally:
+                        expanding.discard(ref)
+                return resolved[ref]
+            return {key: value if key in _DATA_KEYWORDS else inline(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [inline(item) for item in node]
+        return node
+
+    return inline(schema)
+
+
+# Validator for the schema object _get_schema last returned
+_validator: Optional[tuple[dict, Validator]] = None
+
+
+def _get_validator(schema: dict) -> Validator:
+    """Return a validator for schema, checking and building it once per schema object.
+
+    jsonschema.validate() re-checks the schema against its metaschema on every
+    call, which costs far more than validating a test file. _get_schema keeps
+    handing out the same dict while it is cached, so the validator is reused
+    across calls and rebuilt only when a different schema comes back. The
+    validator is built from a copy of the schema with its local $refs inlined.
+    """
+    global _validator
+    cached = _validator
+    if cached is None or cached[0] is not schema:
+        validator_cls = validator_for(schema)
+        validator_cls.check_schema(schema)
+        cached = _validator = (schema, validator_cls(_inline_refs(schema)))
+    return cached[1]
 
 
 @mcp.tool()
@@ -54,6 +289,17 @@ def validate_schema(test_file_path: str) -> ValidationResult:
         ... else:
         ...     print(f"Validation failed: {result['errors']}")
     """
+    return _validate_schema(test_file_path)[0]
+
+
+def _validate_schema(test_file_path: str) -> tuple[ValidationResult, bool]:
+    """Validate a test file like validate_schema.
+
+    Also returns whether the result depends only on the file's content and
+    the schema, which holds for a successful validation, a schema violation
+    and invalid YAML. Other failures, such as a missing or unreadable file or
+    a failed schema download, may go away without the file changing.
+    """
     try:
         # Fetch the JSON schema (cached)
         schema = _get_schema(schema_url)
@@ -63,53 +309,57 @@ def validate_schema(test_file_path: str) -> ValidationResult:
         if not test_file.exists():
             raise FileNotFoundError(f"Test file not found: {test_file_path}")
 
-        with open(test_file, 'r', encoding='utf-8') as f:
-            test_data = yaml.safe_load(f)
+        # Hand libyaml the binary stream; it detects the encoding itself, and
+        # error marks keep the file name
+        with open(test_file, 'rb') as f:
+            test_data = yaml.load(f, Loader=YamlLoader)
 
-        # Validate the test data against the schema
-        validate(instance=test_data, schema=schema)
+        # Validate the test data against the schema, reporting the most relevant error
+        error = best_match(_get_validator(schema).iter_errors(test_data))
+        if error is not None:
+            raise error
 
         return ValidationResult(
             success=True,
             message=f"Validation successful for {test_file_path}"
-        )
+        ), True
 
     except FileNotFoundError as e:
         return ValidationResult(
             success=False,
             message=str(e),
             errors=[str(e)]
-        )
+        ), False
 
     except yaml.YAMLError as e:
         return ValidationResult(
             success=False,
             message=f"Invalid YAML syntax in {test_file_path}",
             errors=[f"YAML parsing error: {str(e)}"]
-        )
+        ), True
 
     except requests.RequestException as e:
         return ValidationResult(
             success=False,
             message=f"Failed to fetch schema from {schema_url}",
             errors=[f"Network error: {str(e)}"]
-        )
+        ), False
 
     except ValidationError as e:
         return ValidationResult(
             success=False,
             message=f"Schema validation failed for {test_file_path}",
             errors=[
-                f"Validation error at {'.'.join(str(p) for p in e.path)}: {e.message}"
+                f"Validation error at {'.'.join(map(str, e.path))}: {e.message}"
             ]
-        )
+        ), True
 
     except Exception as e:
         return ValidationResult(
             success=False,
             message="Unexpected error during validation",
             errors=[f"Error: {str(e)}"]
-        )
+        ), False
 
 
 @mcp.tool()
@@ -142,53 +392,77 @@ def validate_tests(dir_path: str, pattern: Optional[str] = "") -> list[Validatio
         ...         print(f"Failed: {result.message}")
         ...         print(f"Errors: {result.errors}")
     """
-    # Validate input
-    if not dir_path:
-        raise ValueError("dir_path cannot be empty")
+    # Collect the matching files with the directory walk shared with get_tests
+    file_paths = [entry.path for entry in iter_test_files(dir_path, pattern)]
+    if not file_paths:
+        return []
 
-    if not isinstance(dir_path, str):
-        raise TypeError(f"dir_path must be a string, got {type(dir_path).__name__}")
+    # Results are only reused against the schema they were produced with. If it
+    # cannot be fetched, validate_schema reports the failure for every file.
+    try:
+        schema: Optional[dict] = _get_schema(schema_url)
+    except requests.RequestException:
+        schema = None
 
-    # Check if directory exists
-    if not os.path.exists(dir_path):
-        raise FileNotFoundError(f"Directory not found: {dir_path}")
+    # Build the validator once up front, so the workers do not each build it on a cold start
+    if schema is not None:
+        try:
+            _get_validator(schema)
+        except Exception:
+            # An invalid schema is reported by validate_schema for every file
+            pass
 
-    if not os.path.isdir(dir_path):
-        raise NotADirectoryError(f"Path is not a directory: {dir_path}")
+    # Validate the files concurrently; map keeps the results in walk order
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(file_paths))) as executor:
+        return list(executor.map(_validate_file, file_paths, [schema] * len(file_paths)))
 
-    # Determine the pattern to use
-    if pattern is None or pattern.strip() == "":
-        # Default pattern: match all .yaml files
-        file_pattern = re.compile(r".*\.yaml$", re.IGNORECASE)
-    else:
-        # Use the provided regex pattern
-        try:
-            file_pattern = re.compile(pattern)
-        except re.error as e:
-            raise ValueError(f"Invalid regex pattern '{pattern}': {e}")
 
-    validation_results = []
+def _validate_file(file_path: str, schema: Optional[dict] = None) -> ValidationResult:
+    """Validate a single file for validate_tests, turning any exception into a failed result.
 
-    # Recursively walk through directory
-    for root, dirs, files in os.walk(dir_path):
-        for filename in files:
-            # Check if filename matches the pattern
-            if file_pattern.match(filename):
-                file_path = os.path.join(root, filename)
+    When schema is given, results that depend only on the file's content are
+    cached by path and reused while the file's mtime and size are unchanged
+    and _get_schema still returns schema. Callers always get their own copy.
+    """
+    try:
+        if schema is None:
+            return _validate_schema(file_path)[0]
 
-                # Validate the file
-                try:
-                    result = validate_schema(file_path)
-                    validation_results.append(result)
-                except Exception as e:
-                    # If validate_schema raises an exception (shouldn't happen as it catches all),
-                    # create a failed validation result
-                    validation_results.append(
-                        ValidationResult(
-                            success=False,
-                            message=f"Unexpected error validating {file_path}",
-                            errors=[f"Error: {str(e)}"]
-                        )
-                    )
-
-    return validation_results
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return _validate_schema(file_path)[0]
+
+        with _result_cache_lock:
+            cached = _result_cache.get(file_path)
+            if cached is not None:
+                _result_cache.move_to_end(file_path)
+        if (cached is not None and cached[0] == st.st_mtime_ns
+                and cached[1] == st.st_size and cached[2] is schema):
+            return _copy_result(cached[3])
+
+        result, cacheable = _validate_schema(file_path)
+        with _result_cache_lock:
+            if cacheable:
+                _result_cache[file_path] = (st.st_mtime_ns, st.st_size, schema, result)
+                _result_cache.move_to_end(file_path)
+                if len(_result_cache) > _RESULT_CACHE_SIZE:
+                    _result_cache.popitem(last=False)
+            else:
+                _result_cache.pop(file_path, None)
+        return _copy_result(result)
+    except Exception as e:
+        # If _validate_schema raises an exception (shouldn't happen as it catches all),
+        # create a failed validation result
+        return ValidationResult(
+            success=False,
+            message=f"Unexpected error validating {file_path}",
+            errors=[f"Error: {str(e)}"]
+        )
+
+
+def _copy_result(result: ValidationResult) -> ValidationResult:
+    """Copy a cached result, so that callers changing its errors cannot alter the cached one."""
+    if result.errors is None:
+        return result
+    return replace(result, errors=list(result.errors))
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Any
 
 
-@dataclass
+@dataclass(frozen=True)
 class TestFile:
     __test__ = False
     suite: str
@@ -11,7 +11,7 @@ class TestFile:
     file_path: str
 
 
-@dataclass
+@dataclass(frozen=True)
 class ValidationResult:
     """Result of schema validation operation.
 
@@ -26,7 +26,7 @@ class ValidationResult:
     errors: list[str] | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TestCaseResult:
     __test__ = False
     """Individual test case result.
@@ -45,7 +45,7 @@ class TestCaseResult:
     message: str | None = None
 
 
-@dataclass
+@dataclass(frozen=True)
 class TestResultSummary:
     __test__ = False
     """Summary of test execution results.
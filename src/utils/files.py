@@ -0,0 +1,130 @@
+import os
+import re
+import stat
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Optional
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader  # type: ignore[assignment]
+
+
+# Thread pool size for the tools that read test files: the work is dominated
+# by file I/O and YAML parsing, so use more threads than cores
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+@lru_cache(maxsize=128)
+def compile_pattern(pattern: str) -> re.Pattern[str]:
+    """Compile a user-supplied file pattern, cached across tool calls.
+
+    Shared by get_tests and validate_tests, so repeated calls with the same
+    pattern reuse one compiled expression.
+
+    Raises:
+        ValueError: If the pattern is not a valid regular expression
+    """
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid regex pattern '{pattern}': {e}")
+
+
+def is_yaml_filename(filename: str) -> bool:
+    """Default file filter used when no pattern is supplied: all .yaml files, in any case."""
+    return filename.lower().endswith(".yaml")
+
+
+def iter_files(dir_path: str, skipped_dirs: frozenset[str] = frozenset()) -> Iterator[os.DirEntry[str]]:
+    """Recursively yield the non-directory entries below dir_path.
+
+    Uses os.scandir so that file type checks are answered from the cached
+    directory entry instead of an extra stat call. Like os.walk, files of a
+    directory are yielded before its subdirectories are visited, symlinked
+    directories are not descended into, entries whose type cannot be
+    determined are treated as files, and directories that cannot be listed,
+    or that fail while being listed, are skipped. Directories whose name is in
+    skipped_dirs are pruned. An explicit stack keeps deep trees from hitting
+    the recursion limit.
+    """
+    stack = [dir_path]
+    while stack:
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+
+                    if not is_dir:
+                        files.append(entry)
+                        continue
+                    if entry.name in skipped_dirs:
+                        continue
+                    try:
+                        is_symlink = entry.is_symlink()
+                    except OSError:
+                        is_symlink = True
+                    if not is_symlink:
+                        subdirs.append(entry.path)
+        except OSError:
+            # Removed or made unreadable before or during the listing
+            continue
+
+        yield from files
+        # Reversed, so subdirectories are taken off the stack in listing order
+        stack.extend(reversed(subdirs))
+
+
+def iter_test_files(
+    dir_path: str,
+    pattern: Optional[str] = "",
+    skipped_dirs: frozenset[str] = frozenset(),
+) -> Iterator[os.DirEntry[str]]:
+    """Yield the files below dir_path whose name matches pattern, in walk order.
+
+    The directory walk shared by get_tests and validate_tests. The arguments
+    are validated immediately, the directory is walked lazily.
+
+    Args:
+        dir_path: Path to the directory to search for test files
+        pattern: Optional regex pattern to filter file names. If empty or None,
+                matches all .yaml files.
+        skipped_dirs: Names of directories not to descend into
+
+    Raises:
+        ValueError: If dir_path is empty or pattern is an invalid regex
+        TypeError: If dir_path is not a string
+        FileNotFoundError: If the directory doesn't exist
+        NotADirectoryError: If dir_path is not a directory
+    """
+    # Validate input
+    if not dir_path:
+        raise ValueError("dir_path cannot be empty")
+
+    if not isinstance(dir_path, str):
+        raise TypeError(f"dir_path must be a string, got {type(dir_path).__name__}")
+
+    # Check that the directory exists with a single stat call
+    try:
+        st = os.stat(dir_path)
+    except (OSError, ValueError):
+        raise FileNotFoundError(f"Directory not found: {dir_path}") from None
+
+    if not stat.S_ISDIR(st.st_mode):
+        raise NotADirectoryError(f"Path is not a directory: {dir_path}")
+
+    # Determine the pattern to use
+    match: Callable[[str], Any]
+    if pattern is None or pattern.strip() == "":
+        # Default: a plain suffix check is much cheaper than a regex per file
+        match = is_yaml_filename
+    else:
+        # Use the provided regex pattern (compiled once per distinct pattern)
+        match = compile_pattern(pattern).match
+
+    return (entry for entry in iter_files(dir_path, skipped_dirs) if match(entry.name))
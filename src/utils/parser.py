@@ -1,11 +1,74 @@
-from typing import Literal
+import io
+import os
+import stat
+from collections import Counter
+from dataclasses import replace
+from functools import lru_cache
+from typing import IO, Iterator, Literal, Optional, Union, cast
 import xml.etree.ElementTree as ET
-from pathlib import Path
 from utils.dtos import TestResultSummary, TestCaseResult
 
 
 TestFormat = Literal["junit", "xunit", "nunit"]
 
+# Size of the chunks fed to the pull parser (1 MiB)
+_CHUNK_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=1024)
+def _parse_time(value: str) -> float:
+    """Convert a test case time attribute to seconds; a missing or empty time is 0.
+
+    Reports repeat a small set of short durations ("0.001", "0.002", ...),
+    so converted values are cached by their string.
+    """
+    return float(value) if value else 0.0
+
+
+# xUnit result attributes (lowercased) that differ from their normalized status
+_XUNIT_STATUS = {"pass": "passed", "fail": "failed", "skip": "skipped"}
+
+
+def _normalize_nunit_result(result: str) -> str:
+    """Normalize an NUnit result attribute by the keywords it contains."""
+    normalized_result = result.lower()
+    if "success" in normalized_result or "pass" in normalized_result:
+        return "passed"
+    elif "fail" in normalized_result:
+        return "failed"
+    elif "error" in normalized_result:
+        return "error"
+    elif "skip" in normalized_result or "ignore" in normalized_result:
+        return "skipped"
+    return normalized_result
+
+
+# Normalized status of the result attributes NUnit 2 and 3 emit, so the common
+# case is a single dict lookup. Unknown values fall back to keyword matching.
+_NUNIT_STATUS = {
+    result: _normalize_nunit_result(result)
+    for result in (
+        "Success", "Passed", "Failure", "Failed", "Error", "Ignored", "Skipped",
+        "Inconclusive", "NotRunnable", "Cancelled", "Warning",
+    )
+}
+
+
+def _stat_report_file(test_result: str) -> Optional[os.stat_result]:
+    """Stat test_result as a report path with a single os.stat call.
+
+    Returns None for XML strings (anything starting with '<'), for strings too
+    long to be a path, and for paths that are missing or not regular files.
+    """
+    # Path names have a limit, avoids OSError: [Errno 63] File name too long
+    if len(test_result) >= 4096 or test_result.lstrip().startswith('<'):
+        return None
+    try:
+        st = os.stat(test_result)
+    except (OSError, ValueError):
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
 
 class TestResultParser(object):
     __test__ = False
@@ -13,15 +76,32 @@ class TestResultParser(object):
     def __init__(self, report_type: TestFormat):
         self.report_type = report_type
 
-    def parse(self, test_result: str) -> TestResultSummary:
+    def parse(self, test_result: str, use_cache: bool = True) -> TestResultSummary:
         """Parse test results from a file or XML string.
 
         Args:
             test_result (str): Path to test result file or XML string
+            use_cache (bool): Whether a report file may be served from, and kept
+                              in, the parsed-report cache. Pass False for files
+                              that are read once, such as temporary reports.
 
         Returns:
             TestResultSummary: Parsed test results
         """
+        # Report files are cached on their modification time and size, so
+        # repeated parses of an unchanged file skip the XML work entirely.
+        # XML strings, and anything that cannot be stat'ed, are parsed directly.
+        if use_cache:
+            st = _stat_report_file(test_result)
+            if st is not None:
+                summary = _parse_file_cached(test_result, st.st_mtime_ns, st.st_size, self.report_type)
+                # Every caller gets its own list, so the cached summary cannot be altered
+                return replace(summary, test_cases=list(summary.test_cases))
+
+        return self._parse(test_result)
+
+    def _parse(self, test_result: str) -> TestResultSummary:
+        """Dispatch to the parser for the configured report type."""
         if self.report_type == "junit":
             return self._parse_junit(test_result)
         elif self.report_type == "xunit":
@@ -31,41 +111,27 @@ class TestResultParser(object):
         else:
             raise ValueError(f"Unsupported report type: {self.report_type}")
 
-    def _get_root(self, test_result: str) -> ET.Element:
-        """Get the root element from a file path or XML string.
+    def _get_source(self, test_result: str) -> Union[str, IO[str]]:
+        """Resolve a file path or XML string into a source ET.iterparse can read.
 
         Args:
             test_result (str): Path to XML file or XML string
 
         Returns:
-            ET.Element: Root element of the XML
+            Union[str, IO[str]]: The file path, or the XML string wrapped in a StringIO
 
         Raises:
             FileNotFoundError: If the test result file doesn't exist and it's not an XML string
-            ET.ParseError: If the XML is malformed
         """
-        # Try to treat it as a file path first, but only if it's not too long
-        # and doesn't look like XML (starts with '<')
-        is_file = False
+        # Try to treat it as a file path first
+        if _stat_report_file(test_result) is not None:
+            return test_result
+
         stripped_result = test_result.strip()
 
-        if not stripped_result.startswith('<'):
-            try:
-                # Path names have a limit, avoids OSError: [Errno 63] File name too long
-                if len(test_result) < 4096:
-                    path = Path(test_result)
-                    if path.exists() and path.is_file():
-                        is_file = True
-            except OSError:
-                pass
-
-        if is_file:
-            tree = ET.parse(test_result)
-            return tree.getroot()
-
-        # If it looks like XML, try to parse it from string
+        # If it looks like XML, parse it from the string
         if stripped_result.startswith('<'):
-            return ET.fromstring(test_result)
+            return io.StringIO(test_result)
 
         # If it's not a file and doesn't explicitly look like XML,
         # we need to decide if it's a missing file or an invalid XML string.
@@ -78,7 +144,42 @@ class TestResultParser(object):
             raise FileNotFoundError(f"File not found: {test_result}")
 
         # Otherwise, try to parse it as an XML string (which may raise ET.ParseError)
-        return ET.fromstring(test_result)
+        return io.StringIO(test_result)
+
+    def _iter_events(self, test_result: str) -> Iterator[tuple[str, ET.Element]]:
+        """Stream the start/end events of a report file or XML string.
+
+        Reports are fed to an XMLPullParser in chunks rather than loaded as a
+        whole tree; files are read in binary so the XML declaration decides the
+        encoding. The format parsers aggregate each test case on its end event
+        and then clear it, so memory stays flat however large the report is.
+
+        Args:
+            test_result (str): Path to XML file or XML string
+
+        Returns:
+            Iterator[tuple[str, ET.Element]]: (event, element) pairs in document order
+
+        Raises:
+            FileNotFoundError: If the test result file doesn't exist and it's not an XML string
+            ET.ParseError: If the XML is malformed (raised while iterating)
+        """
+        source = self._get_source(test_result)
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                yield from self._pull_events(f)
+        else:
+            yield from self._pull_events(source)
+
+    @staticmethod
+    def _pull_events(stream: Union[IO[str], IO[bytes]]) -> Iterator[tuple[str, ET.Element]]:
+        """Feed a stream to an XMLPullParser chunk by chunk, yielding its events."""
+        parser: ET.XMLPullParser = ET.XMLPullParser(events=("start", "end"))
+        while chunk := stream.read(_CHUNK_SIZE):
+            parser.feed(chunk)
+            yield from cast(Iterator[tuple[str, ET.Element]], parser.read_events())
+        parser.close()
+        yield from cast(Iterator[tuple[str, ET.Element]], parser.read_events())
 
     def _parse_nunit(self, test_result: str) -> TestResultSummary:
         """Parse NUnit format test results.
@@ -93,8 +194,6 @@ class TestResultParser(object):
             FileNotFoundError: If the test result file doesn't exist
             ET.ParseError: If the XML is malformed
         """
-        root = self._get_root(test_result)
-
         # Initialize counters
         total_tests = 0
         total_passed = 0
@@ -102,87 +201,107 @@ class TestResultParser(object):
         total_skipped = 0
         total_errors = 0
         total_time = 0.0
-        test_cases = []
-
-        # NUnit 2.x style
-        if root.tag == 'test-results':
-            total_tests = int(root.get('total', 0))
-            total_errors = int(root.get('errors', 0))
-            total_failed = int(root.get('failures', 0))
-            total_skipped = int(root.get('skipped', 0)) + int(root.get('ignored', 0)) + int(root.get('not-run', 0))
-
-            # Handle time - it might be a duration or a timestamp
-            time_val = root.get('time', '0')
-            try:
-                total_time = float(time_val)
-            except ValueError:
-                # If time is a timestamp (like "20:10:11"), we'll set it to 0 and calculate from suites later if needed
-                total_time = 0.0
-
-            total_passed = total_tests - total_failed - total_errors - total_skipped
-
-            # Find all test cases recursively
-            suites_sum_time = 0.0
-            for suite in root.findall('.//test-suite'):
-                suite_name = suite.get('name', 'Unknown')
-
-                # Update total time from top-level suites if root time was invalid
-                suite_time_attr = suite.get('time')
-                if suite_time_attr:
+        test_cases: list[TestCaseResult] = []
+
+        # Open elements from the root down to the current one
+        stack: list[ET.Element] = []
+        is_nunit2 = False
+        suites_sum_time = 0.0
+        # The open test case and its failure, picked up from the event stream
+        case: ET.Element | None = None
+        case_failure: ET.Element | None = None
+
+        append_case = test_cases.append
+        for event, elem in self._iter_events(test_result):
+            tag = elem.tag
+            if event == "start":
+                stack.append(elem)
+
+                # NUnit 2.x style
+                if len(stack) == 1 and tag == 'test-results':
+                    is_nunit2 = True
+                    total_tests = int(elem.get('total', 0))
+                    total_errors = int(elem.get('errors', 0))
+                    total_failed = int(elem.get('failures', 0))
+                    total_skipped = int(elem.get('skipped', 0)) + int(elem.get('ignored', 0)) + int(elem.get('not-run', 0))
+
+                    # Handle time - it might be a duration or a timestamp
+                    time_val = elem.get('time', '0')
                     try:
-                        suites_sum_time += float(suite_time_attr)
+                        total_time = float(time_val)
                     except ValueError:
-                        pass
-
-                # Check for test-cases inside this suite's results
-                results = suite.find('results')
-                if results is not None:
-                    for tc in results.findall('test-case'):
-                        tc_name = tc.get('name', 'Unknown')
-                        tc_time = float(tc.get('time', 0.0))
-                        tc_result = tc.get('result', 'Unknown')
-
-                        # Normalize result string
-                        normalized_result = tc_result.lower()
-                        if "success" in normalized_result or "pass" in normalized_result:
-                            normalized_result = "passed"
-                        elif "fail" in normalized_result:
-                            normalized_result = "failed"
-                        elif "error" in normalized_result:
-                            normalized_result = "error"
-                        elif "skip" in normalized_result or "ignore" in normalized_result:
-                            normalized_result = "skipped"
-
-                        tc_message = None
-                        failure = tc.find('failure')
-                        if failure is not None:
-                            message_elem = failure.find('message')
-                            stack_trace_elem = failure.find('stack-trace')
-
-                            msg = (message_elem.text or "").strip() if message_elem is not None else ""
-                            stack = (stack_trace_elem.text or "") if stack_trace_elem is not None else ""
-
-                            if msg and stack:
-                                tc_message = f"{msg}\n{stack}"
-                            else:
-                                tc_message = msg or stack or None
-
-                        test_cases.append(
-                            TestCaseResult(
-                                name=tc_name,
-                                suite=suite_name,
-                                result=normalized_result,
-                                time=tc_time,
-                                message=tc_message.strip() if tc_message else None
-                            )
-                        )
-
-            if total_time == 0.0:
-                # Note: NUnit 2.x often has multiple top-level suites or nested ones.
-                # Here we just use the sum if the root was clearly a timestamp.
-                # However, helm-unittest output seems to have suites for each file.
-                # We'll just use the sum of all suite durations as a fallback.
-                total_time = suites_sum_time
+                        # If time is a timestamp (like "20:10:11"), we'll set it to 0 and calculate from suites later if needed
+                        total_time = 0.0
+
+                    total_passed = total_tests - total_failed - total_errors - total_skipped
+
+                elif is_nunit2 and tag == 'test-suite':
+                    # Update total time from suites if root time was invalid
+                    suite_time_attr = elem.get('time')
+                    if suite_time_attr:
+                        try:
+                            suites_sum_time += float(suite_time_attr)
+                        except ValueError:
+                            pass
+
+                # Test cases are listed in the <results> of their test suite
+                elif (
+                    is_nunit2 and tag == 'test-case' and len(stack) >= 3
+                    and stack[-2].tag == 'results' and stack[-3].tag == 'test-suite'
+                ):
+                    case = elem
+                    case_failure = None
+                continue
+
+            if tag == 'failure' and case is not None and stack[-2] is case:
+                if case_failure is None:
+                    case_failure = elem
+            elif elem is case:
+                case = None
+                tc = elem
+                suite_name = stack[-3].get('name', 'Unknown')
+                tc_name = tc.get('name', 'Unknown')
+                tc_time = _parse_time(tc.get('time', ''))
+                tc_result = tc.get('result', 'Unknown')
+
+                # Normalize result string
+                normalized_result = _NUNIT_STATUS.get(tc_result) or _normalize_nunit_result(tc_result)
+
+                tc_message = None
+                failure = case_failure
+                if failure is not None:
+                    message_elem = failure.find('message')
+                    stack_trace_elem = failure.find('stack-trace')
+
+                    msg = (message_elem.text or "").strip() if message_elem is not None else ""
+                    stack_trace = (stack_trace_elem.text or "") if stack_trace_elem is not None else ""
+
+                    if msg and stack_trace:
+                        tc_message = f"{msg}\n{stack_trace}"
+                    else:
+                        tc_message = msg or stack_trace or None
+
+                append_case(
+                    TestCaseResult(
+                        name=tc_name,
+                        suite=suite_name,
+                        result=normalized_result,
+                        time=tc_time,
+                        message=tc_message.strip() if tc_message else None
+                    )
+                )
+                tc.clear()
+            elif tag == 'test-suite':
+                elem.clear()
+
+            stack.pop()
+
+        if is_nunit2 and total_time == 0.0:
+            # Note: NUnit 2.x often has multiple top-level suites or nested ones.
+            # Here we just use the sum if the root was clearly a timestamp.
+            # However, helm-unittest output seems to have suites for each file.
+            # We'll just use the sum of all suite durations as a fallback.
+            total_time = suites_sum_time
 
         return TestResultSummary(
             total=total_tests,
@@ -207,99 +326,122 @@ class TestResultParser(object):
             FileNotFoundError: If the test result file doesn't exist
             ET.ParseError: If the XML is malformed
         """
-        root = self._get_root(test_result)
-
         # Initialize counters
-        total_tests = 0
-        total_passed = 0
-        total_failed = 0
-        total_skipped = 0
-        total_errors = 0
         total_time = 0.0
-        test_cases = []
-
-        # JUnit can have <testsuites> as root or <testsuite>
-        suites = []
-        if root.tag == 'testsuites':
-            suites = root.findall('testsuite')
-            # Try to get total time from root if available
-            root_time = root.get('time')
-            if root_time:
-                total_time = float(root_time)
-        elif root.tag == 'testsuite':
-            suites = [root]
-        else:
-            # Fallback for some non-standard roots that might contain testsuites
-            suites = root.findall('.//testsuite')
-
-        for suite in suites:
-            suite_name = suite.get('name', 'Unknown')
-
-            # If we don't have total time from root, sum it up from suites
-            if root.tag != 'testsuites' or not root.get('time'):
-                suite_time = suite.get('time')
-                if suite_time:
-                    total_time += float(suite_time)
-
-            for tc in suite.findall('.//testcase'):
-                tc_name = tc.get('name', 'Unknown')
-                tc_time = float(tc.get('time', 0.0))
-                tc_result = "passed"
-                tc_message = None
-
-                # Check for failure/error/skipped
-                failure = tc.find('failure')
-                error = tc.find('error')
-                skipped = tc.find('skipped')
-
-                if failure is not None:
-                    tc_result = "failed"
-                    msg_attr = failure.get('message')
-                    msg_text = failure.text
-                    if msg_attr and msg_text:
-                        tc_message = f"{msg_attr}\n{msg_text}"
-                    else:
-                        tc_message = msg_attr or msg_text
-                    total_failed += 1
-                elif error is not None:
-                    tc_result = "error"
-                    msg_attr = error.get('message')
-                    msg_text = error.text
-                    if msg_attr and msg_text:
-                        tc_message = f"{msg_attr}\n{msg_text}"
-                    else:
-                        tc_message = msg_attr or msg_text
-                    total_errors += 1
-                elif skipped is not None:
-                    tc_result = "skipped"
-                    msg_attr = skipped.get('message')
-                    msg_text = skipped.text
-                    if msg_attr and msg_text:
-                        tc_message = f"{msg_attr}\n{msg_text}"
-                    else:
-                        tc_message = msg_attr or msg_text
-                    total_skipped += 1
+        test_cases: list[TestCaseResult] = []
+
+        depth = 0
+        root_tag = None
+        sum_suite_times = True
+        # The test suite whose test cases are currently being collected
+        suite: ET.Element | None = None
+        suite_name = 'Unknown'
+        # The open test case and its failure/error/skipped children, picked up
+        # from the same event stream instead of searching each case afterwards
+        case: ET.Element | None = None
+        case_depth = 0
+        outcomes: dict[str, ET.Element] = {}
+
+        append_case = test_cases.append
+        for event, elem in self._iter_events(test_result):
+            tag = elem.tag
+            if event == "start":
+                depth += 1
+                if root_tag is None:
+                    root_tag = tag
+                    # JUnit can have <testsuites> as root or <testsuite>
+                    if root_tag == 'testsuites':
+                        # Try to get total time from root if available
+                        root_time = elem.get('time')
+                        if root_time:
+                            total_time = float(root_time)
+                            sum_suite_times = False
+
+                # Suites are the children of a <testsuites> root, the <testsuite>
+                # root itself, or for non-standard roots the outermost nested suites
+                if tag == 'testsuite' and suite is None and (root_tag != 'testsuites' or depth == 2):
+                    suite = elem
+                    suite_name = elem.get('name', 'Unknown')
+
+                    # If we don't have total time from root, sum it up from suites
+                    if sum_suite_times:
+                        suite_time = elem.get('time')
+                        if suite_time:
+                            total_time += float(suite_time)
+                elif tag == 'testcase' and suite is not None:
+                    case = elem
+                    case_depth = depth
+                    outcomes = {}
+                continue
+
+            depth -= 1
+            if elem is suite:
+                suite = None
+                elem.clear()
+                continue
+
+            if elem is not case:
+                if case is not None and depth == case_depth and tag in ('failure', 'error', 'skipped'):
+                    outcomes.setdefault(tag, elem)
+                continue
+
+            case = None
+            tc = elem
+            tc_name = tc.get('name', 'Unknown')
+            tc_time = _parse_time(tc.get('time', ''))
+            tc_result = "passed"
+            tc_message = None
+
+            # Check for failure/error/skipped
+            failure = outcomes.get('failure')
+            error = outcomes.get('error')
+            skipped = outcomes.get('skipped')
+
+            if failure is not None:
+                tc_result = "failed"
+                msg_attr = failure.get('message')
+                msg_text = failure.text
+                if msg_attr and msg_text:
+                    tc_message = f"{msg_attr}\n{msg_text}"
                 else:
-                    total_passed += 1
-
-                total_tests += 1
-
-                test_cases.append(
-                    TestCaseResult(
-                        name=tc_name,
-                        suite=suite_name,
-                        result=tc_result,
-                        time=tc_time,
-                        message=tc_message.strip() if tc_message else None
-                    )
+                    tc_message = msg_attr or msg_text
+            elif error is not None:
+                tc_result = "error"
+                msg_attr = error.get('message')
+                msg_text = error.text
+                if msg_attr and msg_text:
+                    tc_message = f"{msg_attr}\n{msg_text}"
+                else:
+                    tc_message = msg_attr or msg_text
+            elif skipped is not None:
+                tc_result = "skipped"
+                msg_attr = skipped.get('message')
+                msg_text = skipped.text
+                if msg_attr and msg_text:
+                    tc_message = f"{msg_attr}\n{msg_text}"
+                else:
+                    tc_message = msg_attr or msg_text
+
+            append_case(
+                TestCaseResult(
+                    name=tc_name,
+                    suite=suite_name,
+                    result=tc_result,
+                    time=tc_time,
+                    message=tc_message.strip() if tc_message else None
                 )
+            )
+            tc.clear()
+
+        # Count the outcomes in one pass once all test cases are collected
+        counts = Counter(tc.result for tc in test_cases)
 
         return TestResultSummary(
-            total=total_tests,
-            passed=total_passed,
-            failed=total_failed,
-            skipped=total_skipped,
-            errors=total_errors,
+            total=len(test_cases),
+            passed=counts["passed"],
+            failed=counts["failed"],
+            skipped=counts["skipped"],
+            errors=counts["error"],
             time=total_time,
             test_cases=test_cases
         )
@@ -317,8 +459,6 @@ class TestResultParser(object):
             FileNotFoundError: If the test result file doesn't exist
             ET.ParseError: If the XML is malformed
         """
-        root = self._get_root(test_result)
-
         # Initialize counters
         total_tests = 0
         total_passed = 0
@@ -326,61 +466,84 @@ class TestResultParser(object):
         total_skipped = 0
         total_errors = 0
         total_time = 0.0
-        test_cases = []
-
-        # Parse all assemblies (test suites)
-        for assembly in root.findall('.//assembly'):
-            # Get assembly-level statistics
-            total_tests += int(assembly.get('total', 0))
-            total_passed += int(assembly.get('passed', 0))
-            total_failed += int(assembly.get('failed', 0))
-            total_skipped += int(assembly.get('skipped', 0))
-            total_errors += int(assembly.get('errors', 0))
-            total_time += float(assembly.get('time', 0.0))
-
-            # Parse collections (test groups within assembly)
-            for collection in assembly.findall('.//collection'):
-                collection_name = collection.get('name', 'Unknown Collection')
-
+        test_cases: list[TestCaseResult] = []
+
+        depth = 0
+        assembly_depth = 0
+        # Open collections (test groups within an assembly), innermost last
+        collections: list[ET.Element] = []
+        # The open test and the first failure found within it
+        test_elem: ET.Element | None = None
+        failure_elem: ET.Element | None = None
+
+        append_case = test_cases.append
+        for event, elem in self._iter_events(test_result):
+            tag = elem.tag
+            if event == "start":
+                depth += 1
+                # Assemblies (test suites) below the root
+                if tag == 'assembly' and depth > 1:
+                    assembly_depth += 1
+                    # Get assembly-level statistics
+                    total_tests += int(elem.get('total', 0))
+                    total_passed += int(elem.get('passed', 0))
+                    total_failed += int(elem.get('failed', 0))
+                    total_skipped += int(elem.get('skipped', 0))
+                    total_errors += int(elem.get('errors', 0))
+                    total_time += float(elem.get('time', 0.0))
+                elif tag == 'collection' and assembly_depth:
+                    collections.append(elem)
+                elif tag == 'test' and collections:
+                    test_elem = elem
+                    failure_elem = None
+                continue
+
+            if tag == 'assembly' and depth > 1:
+                assembly_depth -= 1
+            elif collections and elem is collections[-1]:
+                collections.pop()
+                elem.clear()
+            elif tag == 'failure' and test_elem is not None:
+                if failure_elem is None:
+                    failure_elem = elem
+            elif elem is test_elem:
                 # Parse individual test cases
-                for test in collection.findall('.//test'):
-                    test_name = test.get('name', 'Unknown Test')
-                    test_result_status = test.get('result', 'Unknown')
-                    test_time = float(test.get('time', 0.0))
-
-                    # Normalize result status to lowercase
-                    normalized_result = test_result_status.lower()
-                    if normalized_result == "pass":
-                        normalized_result = "passed"
-                    elif normalized_result == "fail":
-                        normalized_result = "failed"
-                    elif normalized_result == "skip":
-                        normalized_result = "skipped"
-
-                    # Check for failure message
-                    failure_message = None
-                    failure_elem = test.find('.//failure')
-                    if failure_elem is not None:
-                        message_elem = failure_elem.find('message')
-                        stack_trace_elem = failure_elem.find('stack-trace')
-
-                        msg = (message_elem.text or "").strip() if message_elem is not None else ""
-                        stack = (stack_trace_elem.text or "") if stack_trace_elem is not None else ""
-
-                        if msg and stack:
-                            failure_message = f"{msg}\n{stack}"
-                        else:
-                            failure_message = msg or stack or None
-
-                    test_cases.append(
-                        TestCaseResult(
-                            name=test_name,
-                            suite=collection_name,
-                            result=normalized_result,
-                            time=test_time,
-                            message=failure_message.strip() if failure_message else None
-                        )
+                test = elem
+                test_elem = None
+                collection_name = collections[-1].get('name', 'Unknown Collection')
+                test_name = test.get('name', 'Unknown Test')
+                test_result_status = test.get('result', 'Unknown')
+                test_time = _parse_time(test.get('time', ''))
+
+                # Normalize result status to lowercase
+                normalized_result = test_result_status.lower()
+                normalized_result = _XUNIT_STATUS.get(normalized_result, normalized_result)
+
+                # Check for failure message
+                failure_message = None
+                if failure_elem is not None:
+                    message_elem = failure_elem.find('message')
+                    stack_trace_elem = failure_elem.find('stack-trace')
+
+                    msg = (message_elem.text or "").strip() if message_elem is not None else ""
+                    stack = (stack_trace_elem.text or "") if stack_trace_elem is not None else ""
+
+                    if msg and stack:
+                        failure_message = f"{msg}\n{stack}"
+                    else:
+                        failure_message = msg or stack or None
+
+                append_case(
+                    TestCaseResult(
+                        name=test_name,
+                        suite=collection_name,
+                        result=normalized_result,
+                        time=test_time,
+                        message=failure_message.strip() if failure_message else None
                     )
+                )
+                test.clear()
+            depth -= 1
 
         return TestResultSummary(
             total=total_tests,
@@ -391,3 +554,24 @@ class TestResultParser(object):
             time=total_time,
             test_cases=test_cases
         )
+
+
+@lru_cache(maxsize=4)
+def get_parser(report_type: TestFormat) -> TestResultParser:
+    """Return the shared TestResultParser for a report format.
+
+    Parsers hold no per-report state, so one instance per format is reused
+    instead of constructing a new parser for every report.
+    """
+    return TestResultParser(report_type)
+
+
+@lru_cache(maxsize=32)
+def _parse_file_cached(path: str, mtime_ns: int, size: int, report_type: TestFormat) -> TestResultSummary:
+    """Parse a report file, cached on its path, modification time, size and format.
+
+    The modification time and size are only part of the cache key: a report
+    that is rewritten in place gets a new key and is parsed again. The cache is
+    bounded so very large reports do not stay pinned in memory.
+    """
+    return get_parser(report_type)._parse(path)